@@ -15,10 +15,22 @@ class AgentConfig:
     LANGFUSE_HOST: str = os.getenv("LANGFUSE_HOST") or os.getenv("LANGFUSE_BASE_URL", "https://us.cloud.langfuse.com")
 
     DB_PATH: str = os.getenv("AGENTFORGE_DB_PATH", "data/agentforge.db")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+    CONVERSATION_TTL_SECONDS: int = int(os.getenv("AGENT_CONVERSATION_TTL_SECONDS", "86400"))
 
     MAX_ITERATIONS: int = int(os.getenv("AGENT_MAX_ITERATIONS", "10"))
     TIMEOUT_SECONDS: float = float(os.getenv("AGENT_TIMEOUT_SECONDS", "30"))
     MAX_COST_USD: float = float(os.getenv("AGENT_MAX_COST_USD", "0.10"))
+    MAX_TOKENS_PER_REQUEST: int = int(os.getenv("AGENT_MAX_TOKENS_PER_REQUEST", "100000"))
+    MAX_CONVERSATIONS: int = int(os.getenv("AGENT_MAX_CONVERSATIONS", "1000"))
+    MAX_HISTORY_MESSAGES: int = int(os.getenv("AGENT_MAX_HISTORY_MESSAGES", "50"))
+    # 0 leaves concurrent LLM calls unbounded
+    MAX_CONCURRENT_LLM_CALLS: int = int(os.getenv("AGENT_MAX_CONCURRENT_LLM_CALLS", "0"))
 
     PRIMARY_MODEL: str = "claude-sonnet-4-6"
     FALLBACK_MODEL: str = "claude-haiku-4-5-20251001"
@@ -1,11 +1,15 @@
-"""SQLite database layer for stateful dividend features."""
+"""SQLite database layer for stateful dividend features (async, via aiosqlite)."""
 
 import os
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from typing import AsyncIterator
 
-from sqlalchemy import Column, DateTime, Float, String, create_engine
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy import Column, DateTime, Float, String, event, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from agent.config import config
 
@@ -37,32 +41,77 @@ class DividendWatchlistItem(Base):
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
 
-_engine = None
-_SessionFactory = None
+_engine: AsyncEngine | None = None
+_SessionFactory: async_sessionmaker[AsyncSession] | None = None
 
 
-def init_db() -> None:
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Tune every new SQLite connection for concurrent reads and cheap commits.
+
+    WAL lets readers proceed while a write is in flight, and synchronous=NORMAL
+    drops the per-commit fsync of the rollback journal (still durable in WAL).
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB memory-mapped I/O
+    cursor.close()
+
+
+async def init_db() -> None:
     """Create the database engine and tables. Ensures the data/ directory exists."""
     global _engine, _SessionFactory
     db_path = config.DB_PATH
     os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
-    _engine = create_engine(f"sqlite:///{db_path}", echo=False)
-    Base.metadata.create_all(_engine)
-    _SessionFactory = sessionmaker(bind=_engine)
+    _engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        pool_use_lifo=True,
+    )
+    event.listen(_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    async with _engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # expire_on_commit=False: attributes stay loaded after commit, since
+    # lazy refreshes are not possible outside the session in async code.
+    _SessionFactory = async_sessionmaker(_engine, expire_on_commit=False)
+
+
+async def close_db() -> None:
+    """Dispose of the engine's connection pool for clean shutdown."""
+    global _engine, _SessionFactory
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _SessionFactory = None
 
 
-def get_session() -> Session:
-    """Return a new SQLAlchemy session."""
+@asynccontextmanager
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """Yield a new async SQLAlchemy session, always detaching objects and closing it on exit."""
     if _SessionFactory is None:
-        init_db()
-    return _SessionFactory()
+        await init_db()
+    session = _SessionFactory()
+    try:
+        yield session
+    finally:
+        session.expunge_all()
+        await session.close()
 
 
 # ---------------------------------------------------------------------------
 # CRUD helpers — DividendGoal
 # ---------------------------------------------------------------------------
 
-def create_goal(
+async def create_goal(
     target_monthly: float,
     target_annual: float = 0.0,
     currency: str = "USD",
@@ -74,47 +123,50 @@ def create_goal(
     elif target_monthly == 0.0 and target_annual > 0:
         target_monthly = target_annual / 12
 
-    with get_session() as session:
-        goal = DividendGoal(
-            target_monthly=target_monthly,
-            target_annual=target_annual,
-            currency=currency,
-            deadline=deadline or None,
-            notes=notes,
-        )
-        session.add(goal)
-        session.commit()
-        session.refresh(goal)
+    now = datetime.now(timezone.utc)
+    values = {
+        "target_monthly": target_monthly,
+        "target_annual": target_annual,
+        "currency": currency,
+        "deadline": deadline or None,
+        "notes": notes,
+        "created_at": now,
+        "updated_at": now,
+    }
+    # INSERT ... RETURNING yields the persisted row directly, avoiding the
+    # follow-up SELECT that session.refresh() would issue.
+    async with get_session() as session, session.begin():
+        goal = (await session.scalars(insert(DividendGoal).returning(DividendGoal), [values])).one()
         return _goal_to_dict(goal)
 
 
-def get_goals() -> list[dict]:
-    with get_session() as session:
-        goals = session.query(DividendGoal).order_by(DividendGoal.created_at.desc()).all()
+async def get_goals() -> list[dict]:
+    async with get_session() as session:
+        goals = await session.scalars(select(DividendGoal).order_by(DividendGoal.created_at.desc()))
         return [_goal_to_dict(g) for g in goals]
 
 
-def update_goal(goal_id: str, **kwargs) -> dict | None:
-    with get_session() as session:
-        goal = session.query(DividendGoal).filter_by(id=goal_id).first()
+async def update_goal(goal_id: str, **kwargs) -> dict | None:
+    async with get_session() as session:
+        goal = await session.get(DividendGoal, goal_id)
         if not goal:
             return None
         for key, value in kwargs.items():
             if hasattr(goal, key) and value is not None:
                 setattr(goal, key, value)
         goal.updated_at = datetime.now(timezone.utc)
-        session.commit()
-        session.refresh(goal)
+        await session.commit()
+        await session.refresh(goal)
         return _goal_to_dict(goal)
 
 
-def delete_goal(goal_id: str) -> bool:
-    with get_session() as session:
-        goal = session.query(DividendGoal).filter_by(id=goal_id).first()
+async def delete_goal(goal_id: str) -> bool:
+    async with get_session() as session:
+        goal = await session.get(DividendGoal, goal_id)
         if not goal:
             return False
-        session.delete(goal)
-        session.commit()
+        await session.delete(goal)
+        await session.commit()
         return True
 
 
@@ -122,38 +174,59 @@ def delete_goal(goal_id: str) -> bool:
 # CRUD helpers — DividendWatchlistItem
 # ---------------------------------------------------------------------------
 
-def create_watchlist_item(
+async def create_watchlist_item(
     symbol: str,
     dividend_yield: float = 0.0,
     annual_dividend: float = 0.0,
     notes: str = "",
 ) -> dict:
-    with get_session() as session:
-        item = DividendWatchlistItem(
-            symbol=symbol.upper(),
-            dividend_yield=dividend_yield,
-            annual_dividend=annual_dividend,
-            notes=notes,
-        )
-        session.add(item)
-        session.commit()
-        session.refresh(item)
-        return _watchlist_to_dict(item)
-
-
-def get_watchlist() -> list[dict]:
-    with get_session() as session:
-        items = session.query(DividendWatchlistItem).order_by(DividendWatchlistItem.created_at.desc()).all()
+    return (await create_watchlist_items([{
+        "symbol": symbol,
+        "dividend_yield": dividend_yield,
+        "annual_dividend": annual_dividend,
+        "notes": notes,
+    }]))[0]
+
+
+async def create_watchlist_items(items: list[dict]) -> list[dict]:
+    """Insert many watchlist items in a single transaction.
+
+    Each item needs a ``symbol``; ``dividend_yield``, ``annual_dividend`` and
+    ``notes`` are optional.
+    """
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "symbol": item["symbol"].upper(),
+            "dividend_yield": item.get("dividend_yield", 0.0),
+            "annual_dividend": item.get("annual_dividend", 0.0),
+            "notes": item.get("notes", ""),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for item in items
+    ]
+    if not rows:
+        return []
+
+    async with get_session() as session, session.begin():
+        inserted = await session.scalars(insert(DividendWatchlistItem).returning(DividendWatchlistItem), rows)
+        return [_watchlist_to_dict(item) for item in inserted]
+
+
+async def get_watchlist() -> list[dict]:
+    async with get_session() as session:
+        items = await session.scalars(select(DividendWatchlistItem).order_by(DividendWatchlistItem.created_at.desc()))
         return [_watchlist_to_dict(i) for i in items]
 
 
-def delete_watchlist_item(item_id: str) -> bool:
-    with get_session() as session:
-        item = session.query(DividendWatchlistItem).filter_by(id=item_id).first()
+async def delete_watchlist_item(item_id: str) -> bool:
+    async with get_session() as session:
+        item = await session.get(DividendWatchlistItem, item_id)
         if not item:
             return False
-        session.delete(item)
-        session.commit()
+        await session.delete(item)
+        await session.commit()
         return True
 
 
@@ -3,13 +3,100 @@ agent tools should call them via ``asyncio.to_thread()``."""
 
 from __future__ import annotations
 
+import functools
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from types import ModuleType
+from typing import TYPE_CHECKING
 
-import yfinance as yf
+if TYPE_CHECKING:
+    import yfinance as yf
 
 logger = logging.getLogger(__name__)
 
+# Seconds a ``Ticker.info`` payload is reused before Yahoo is queried again
+INFO_TTL_SECONDS = 900
+
+# Most symbols whose info payload is kept in memory at once
+INFO_CACHE_MAXSIZE = 1024
+
+# ``Ticker.info`` fields read by ``get_dividend_info``, in unpacking order
+_INFO_KEYS = (
+    "dividendYield",
+    "dividendRate",
+    "payoutRatio",
+    "fiveYearAvgDividendYield",
+    "currentPrice",
+    "regularMarketPrice",
+)
+
+# Upper bound on concurrent Yahoo requests for multi-symbol helpers
+MAX_FETCH_WORKERS = 16
+
+# Only the info payloads are cached: a ``yf.Ticker`` memoizes its own info
+# and price history, so reusing one would never see fresh data.
+_info_cache: dict[str, tuple[float, dict]] = {}
+# Guards eviction, since multi-symbol helpers fill the cache from threads
+_info_cache_lock = threading.Lock()
+
+
+@functools.cache
+def _yf() -> ModuleType:
+    """Import yfinance on first use; it pulls in pandas and adds noticeable startup time."""
+    import yfinance
+
+    return yfinance
+
+
+def _get_ticker(symbol: str) -> yf.Ticker:
+    """Return a new ``yf.Ticker`` for *symbol*."""
+    return _yf().Ticker(symbol.upper())
+
+
+def _get_info(symbol: str, ttl: float = INFO_TTL_SECONDS) -> dict:
+    """Return ``Ticker.info`` for *symbol*, served from memory while fresher than *ttl*."""
+    key = symbol.upper()
+    cached = _info_cache.get(key)
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < ttl:
+        return cached[1]
+    info = _get_ticker(key).info or {}
+    # An empty payload is usually a throttled or failed lookup; retry it next time
+    if info:
+        with _info_cache_lock:
+            # Re-inserted so dict order stays oldest-first
+            _info_cache.pop(key, None)
+            if len(_info_cache) >= INFO_CACHE_MAXSIZE:
+                for stale in [k for k, (t, _) in _info_cache.items() if now - t >= ttl]:
+                    del _info_cache[stale]
+                if len(_info_cache) >= INFO_CACHE_MAXSIZE:
+                    _info_cache.pop(next(iter(_info_cache)))
+            _info_cache[key] = (now, info)
+    return info
+
+
+def _get_info_many(symbols: list[str]) -> dict[str, dict | None]:
+    """Fetch ``Ticker.info`` for *symbols* concurrently.
+
+    Symbols whose lookup fails map to ``None`` so callers can skip them.
+    """
+    unique = list(dict.fromkeys(symbols))
+    if not unique:
+        return {}
+
+    def fetch(sym: str) -> dict | None:
+        try:
+            return _get_info(sym)
+        except Exception as exc:
+            logger.debug("Failed to fetch info for %s: %s", sym, exc)
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(unique))) as pool:
+        return dict(zip(unique, pool.map(fetch, unique)))
+
 
 class DividendClient:
     """Provides dividend metrics for any publicly traded stock."""
@@ -21,8 +108,9 @@ class DividendClient:
     @staticmethod
     def get_dividend_info(symbol: str) -> dict:
         """Return yield, payout ratio, ex-dividend date, and more for *symbol*."""
-        ticker = yf.Ticker(symbol)
-        info = ticker.info or {}
+        info = _get_info(symbol)
+        upper = symbol.upper()
+        div_yield, div_rate, payout, five_year_avg, current_price, market_price = map(info.get, _INFO_KEYS)
 
         ex_date_raw = info.get("exDividendDate")
         if isinstance(ex_date_raw, (int, float)):
@@ -33,36 +121,35 @@ class DividendClient:
             ex_date = ""
 
         return {
-            "symbol": symbol.upper(),
+            "symbol": upper,
             "name": info.get("shortName") or info.get("longName", symbol),
-            "dividend_yield": round((info.get("dividendYield") or 0) * 100, 2),
-            "annual_dividend": round(info.get("dividendRate") or 0, 4),
-            "payout_ratio": round((info.get("payoutRatio") or 0) * 100, 2),
+            "dividend_yield": round((div_yield or 0) * 100, 2),
+            "annual_dividend": round(div_rate or 0, 4),
+            "payout_ratio": round((payout or 0) * 100, 2),
             "ex_dividend_date": ex_date,
-            "five_year_avg_yield": round((info.get("fiveYearAvgDividendYield") or 0), 2),
-            "market_price": round(info.get("currentPrice") or info.get("regularMarketPrice") or 0, 2),
+            "five_year_avg_yield": round(five_year_avg or 0, 2),
+            "market_price": round(current_price or market_price or 0, 2),
             "currency": info.get("currency", "USD"),
         }
 
     @staticmethod
     def get_dividend_history(symbol: str, years: int = 5) -> list[dict]:
         """Return historical dividend payments for the last *years*."""
-        ticker = yf.Ticker(symbol)
-        divs = ticker.dividends
+        divs = _get_ticker(symbol).dividends
         if divs is None or divs.empty:
             return []
 
-        cutoff = datetime.now(timezone.utc).replace(year=datetime.now(timezone.utc).year - years)
-        records: list[dict] = []
-        for ts, amount in divs.items():
-            dt = ts.to_pydatetime()
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            if dt >= cutoff:
-                records.append({
-                    "date": dt.strftime("%Y-%m-%d"),
-                    "amount": round(float(amount), 4),
-                })
+        import pandas as pd
+
+        cutoff = pd.Timestamp.now(tz="UTC") - pd.DateOffset(years=years)
+        index = divs.index
+        index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+        recent = divs[index >= cutoff]
+
+        records: list[dict] = [
+            {"date": ts.strftime("%Y-%m-%d"), "amount": round(float(amount), 4)}
+            for ts, amount in recent.items()
+        ]
         return records
 
     # ------------------------------------------------------------------
@@ -74,12 +161,13 @@ class DividendClient:
         """Return upcoming ex-dividend dates for a list of symbols."""
         now = datetime.now(timezone.utc)
         upcoming: list[dict] = []
+        infos = _get_info_many(symbols)
 
         for sym in symbols:
+            info = infos.get(sym)
+            if info is None:
+                continue
             try:
-                ticker = yf.Ticker(sym)
-                info = ticker.info or {}
-
                 ex_raw = info.get("exDividendDate")
                 if isinstance(ex_raw, (int, float)):
                     ex_dt = datetime.fromtimestamp(ex_raw, tz=timezone.utc)
@@ -106,16 +194,18 @@ class DividendClient:
         """
         by_holding: list[dict] = []
         total_annual = 0.0
-        quarterly = {"Q1": 0.0, "Q2": 0.0, "Q3": 0.0, "Q4": 0.0}
+
+        infos = _get_info_many([h.get("symbol", "") for h in holdings if h.get("symbol")])
 
         for h in holdings:
             sym = h.get("symbol", "")
             position_value = h.get("value", 0)
             if not sym or position_value <= 0:
                 continue
+            info = infos.get(sym)
+            if info is None:
+                continue
             try:
-                ticker = yf.Ticker(sym)
-                info = ticker.info or {}
                 div_rate = info.get("dividendRate") or 0
                 div_yield = info.get("dividendYield") or 0
 
@@ -133,20 +223,17 @@ class DividendClient:
                     "yield_pct": round(div_yield * 100, 2),
                     "position_value": round(position_value, 2),
                 })
-
-                # Approximate even quarterly split
-                q_amount = annual_income / 4
-                for q in quarterly:
-                    quarterly[q] += q_amount
-
             except Exception as exc:
                 logger.debug("Skipping %s in income projection: %s", sym, exc)
 
         by_holding.sort(key=lambda x: x["annual_income"], reverse=True)
 
+        # Approximate even quarterly split
+        q_amount = round(total_annual / 4, 2)
+
         return {
             "total_annual": round(total_annual, 2),
             "total_monthly": round(total_annual / 12, 2),
             "by_holding": by_holding,
-            "by_quarter": {k: round(v, 2) for k, v in quarterly.items()},
+            "by_quarter": {q: q_amount for q in ("Q1", "Q2", "Q3", "Q4")},
         }
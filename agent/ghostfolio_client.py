@@ -1,9 +1,90 @@
 """HTTP client for Ghostfolio REST API."""
 
+import asyncio
+import functools
+import time
+
 import httpx
+import orjson
 
 from agent.config import config
 
+_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+_LIMITS = httpx.Limits(
+    max_connections=50,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+
+
+def async_ttl_cache(ttl: float = 300, maxsize: int = 256):
+    """Cache results of an async client method for ``ttl`` seconds.
+
+    Entries are keyed on the client's base URL and token plus the call
+    arguments, so different users never share cached responses. A per-key
+    lock makes concurrent misses wait for a single upstream request.
+
+    Results must be JSON-serializable: they are stored serialized and every
+    hit decodes a fresh copy, so callers may mutate what they get back.
+    """
+
+    def decorator(func):
+        cache: dict[tuple, tuple[float, bytes]] = {}
+        # Per-key lock plus the number of callers holding or waiting on it;
+        # the lock is dropped only once nobody is queued behind it
+        locks: dict[tuple, list] = {}
+        stats = {"hits": 0, "misses": 0}
+
+        def store(key: tuple, result) -> None:
+            now = time.monotonic()
+            cache.pop(key, None)
+            if len(cache) >= maxsize:
+                for stale in [k for k, (expires, _) in cache.items() if expires <= now]:
+                    del cache[stale]
+                if len(cache) >= maxsize:
+                    cache.pop(next(iter(cache)))
+            cache[key] = (now + ttl, orjson.dumps(result))
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            key = (self.base_url, self.token, args, tuple(sorted(kwargs.items())))
+            entry = cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                stats["hits"] += 1
+                return orjson.loads(entry[1])
+
+            slot = locks.setdefault(key, [asyncio.Lock(), 0])
+            slot[1] += 1
+            try:
+                async with slot[0]:
+                    entry = cache.get(key)
+                    if entry is not None and entry[0] > time.monotonic():
+                        stats["hits"] += 1
+                        return orjson.loads(entry[1])
+                    stats["misses"] += 1
+                    result = await func(self, *args, **kwargs)
+                    store(key, result)
+            finally:
+                # Released even when the call raises, so failing keys do not
+                # leave locks behind
+                slot[1] -= 1
+                if not slot[1]:
+                    del locks[key]
+            return result
+
+        def cache_info() -> dict:
+            return {**stats, "size": len(cache), "maxsize": maxsize, "ttl": ttl}
+
+        def cache_clear() -> None:
+            cache.clear()
+            stats.update(hits=0, misses=0)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
 
 class GhostfolioClient:
     """Async client for interacting with the Ghostfolio API."""
@@ -13,11 +94,17 @@ class GhostfolioClient:
     def __init__(self, token: str | None = None):
         self.base_url = config.GHOSTFOLIO_API_URL.rstrip("/")
         self.token = token or config.GHOSTFOLIO_API_TOKEN
+        self._auth_headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
 
     @classmethod
     def _get_client(cls) -> httpx.AsyncClient:
         if cls._shared_client is None or cls._shared_client.is_closed:
-            cls._shared_client = httpx.AsyncClient(timeout=10.0)
+            cls._shared_client = httpx.AsyncClient(
+                http2=True,
+                timeout=_TIMEOUT,
+                limits=_LIMITS,
+                headers={"Content-Type": "application/json"},
+            )
         return cls._shared_client
 
     @classmethod
@@ -27,18 +114,12 @@ class GhostfolioClient:
             await cls._shared_client.aclose()
             cls._shared_client = None
 
-    def _headers(self) -> dict:
-        headers = {"Content-Type": "application/json"}
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
-        return headers
-
     async def _get(self, path: str, params: dict | None = None) -> dict:
         """Make an authenticated GET request to Ghostfolio API."""
         client = self._get_client()
         response = await client.get(
             f"{self.base_url}{path}",
-            headers=self._headers(),
+            headers=self._auth_headers,
             params=params,
         )
         response.raise_for_status()
@@ -98,16 +179,21 @@ class GhostfolioClient:
 
     # --- Symbol / Market data endpoints ---
 
+    # Quotes move, so the TTL is short; popular symbols still collapse to one
+    # upstream request per minute across concurrent conversations.
+    @async_ttl_cache(ttl=60, maxsize=4096)
     async def get_symbol(self, data_source: str, symbol: str) -> dict:
         """GET /api/v1/symbol/:dataSource/:symbol"""
         return await self._get(f"/v1/symbol/{data_source}/{symbol}")
 
+    @async_ttl_cache(ttl=300)
     async def get_benchmarks(self) -> dict:
         """GET /api/v1/benchmarks"""
         return await self._get("/v1/benchmarks")
 
     # --- Exchange rate ---
 
+    @async_ttl_cache(ttl=300)
     async def get_exchange_rate(
         self, currency_from: str, currency_to: str
     ) -> dict:
@@ -118,6 +204,7 @@ class GhostfolioClient:
 
     # --- Info ---
 
+    @async_ttl_cache(ttl=300)
     async def get_info(self) -> dict:
         """GET /api/v1/info"""
         return await self._get("/v1/info")
@@ -1,115 +1,173 @@
 """LangGraph agent: the core reasoning loop with verification."""
 
 import asyncio
-import json as json_mod
+import contextlib
 import logging
+import operator
+import re
 import time
 import uuid
 from typing import Annotated, AsyncGenerator, TypedDict
 
-from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+import orjson
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_config
 from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
-from langgraph.prebuilt import ToolNode
 
+from agent import memory
 from agent.config import config
 from agent.models import AgentMetrics
-from agent.observability import trace_agent_run
+from agent.observability import enqueue_trace
 from agent.prompts.system import DISCLAIMER_TEMPLATE, SYSTEM_PROMPT
 from agent.tools import ALL_TOOLS
-from agent.verification import ResponseVerifier
+from agent.verification import ResponseVerifier, has_checkable_claims
 
 
 class AgentState(TypedDict):
-    """State schema for the LangGraph agent."""
+    """State schema for the LangGraph agent.
+
+    Nodes return only the keys they change. Keys annotated with
+    ``operator.add`` accumulate: nodes return the increment, not the total.
+    """
 
     messages: Annotated[list[BaseMessage], add_messages]
-    tool_results: list[dict]
+    tool_results: Annotated[list[dict], operator.add]
+    tool_results_cursor: int
+    tools_used: Annotated[list[str], operator.add]
     iterations: int
     confidence: float
     verification_passed: bool
+    final_response: str
     query_type: str
     metrics: dict
-    total_input_tokens: int
-    total_output_tokens: int
+    total_input_tokens: Annotated[int, operator.add]
+    total_output_tokens: Annotated[int, operator.add]
     model_used_last: str
-    sonnet_input_tokens: int
-    sonnet_output_tokens: int
-    haiku_input_tokens: int
-    haiku_output_tokens: int
+    sonnet_input_tokens: Annotated[int, operator.add]
+    sonnet_output_tokens: Annotated[int, operator.add]
+    haiku_input_tokens: Annotated[int, operator.add]
+    haiku_output_tokens: Annotated[int, operator.add]
 
 
 logger = logging.getLogger(__name__)
 
-# Initialize LLM with tool binding — Sonnet for reasoning, Haiku for summarization
-llm = ChatAnthropic(
-    model=config.PRIMARY_MODEL,
-    api_key=config.ANTHROPIC_API_KEY,
-    max_tokens=4096,
-    temperature=0,
+# Query-type keywords, in priority order: when a message matches several
+# categories, the earliest category listed wins.
+_QUERY_TYPE_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "dividend": ("dividend", "income goal", "passive income", "yield", "payout"),
+    "tax": ("tax", "capital gain", "deduct"),
+    "advice": ("should i", "recommend", "suggest", "advice", "optimize"),
+    "compliance": ("compliance", "concentration", "diversif", "risk limit"),
+}
+
+# One alternation with a named group per category, so a single regex scan
+# finds every category present in the message.
+_CLASSIFIER_RE = re.compile(
+    "|".join(
+        f"(?P<{query_type}>{'|'.join(map(re.escape, keywords))})"
+        for query_type, keywords in _QUERY_TYPE_KEYWORDS.items()
+    ),
+    re.IGNORECASE,
 )
-llm_with_tools = llm.bind_tools(ALL_TOOLS)
 
-llm_fast = ChatAnthropic(
-    model=config.FALLBACK_MODEL,
-    api_key=config.ANTHROPIC_API_KEY,
-    max_tokens=4096,
-    temperature=0,
-)
-llm_fast_with_tools = llm_fast.bind_tools(ALL_TOOLS)
+# Built once at import. The system prompt is marked as a prompt-cache
+# breakpoint so repeat passes read it from Anthropic's cache instead of
+# re-processing it.
+_SYSTEM_MSG = SystemMessage(content=[
+    {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}},
+])
 
-verifier = ResponseVerifier()
+# LLM clients and the verifier are built on first use so importing this
+# module (e.g. for /health or the tools listing) stays cheap.
+_llm_with_tools = None
+_llm_fast_with_tools = None
+_verifier: ResponseVerifier | None = None
+_llm_slots: asyncio.Semaphore | None = None
 
 
-async def _trace_in_background(
-    conversation_id: str,
-    input_message: str,
-    output_message: str,
-    tools_used: list[str],
-    confidence: float,
-    metrics: dict,
-    trace_id: str | None = None,
-) -> None:
-    """Fire-and-forget wrapper to run Langfuse tracing off the critical path."""
-    try:
-        await asyncio.to_thread(
-            trace_agent_run,
-            conversation_id=conversation_id,
-            input_message=input_message,
-            output_message=output_message,
-            tools_used=tools_used,
-            confidence=confidence,
-            metrics=metrics,
-            trace_id=trace_id,
+def _get_models():
+    """Return ``(primary, fast)`` tool-bound chat models, creating them on first call.
+
+    Sonnet handles reasoning; Haiku handles summarization passes.
+    """
+    global _llm_with_tools, _llm_fast_with_tools
+    if _llm_with_tools is None:
+        from langchain_anthropic import ChatAnthropic
+
+        llm = ChatAnthropic(
+            model=config.PRIMARY_MODEL,
+            api_key=config.ANTHROPIC_API_KEY,
+            max_tokens=4096,
+            temperature=0,
         )
-    except Exception as e:
-        logger.warning(f"Background Langfuse trace failed: {e}")
+        llm_fast = ChatAnthropic(
+            model=config.FALLBACK_MODEL,
+            api_key=config.ANTHROPIC_API_KEY,
+            max_tokens=4096,
+            temperature=0,
+        )
+        _llm_fast_with_tools = llm_fast.bind_tools(ALL_TOOLS)
+        _llm_with_tools = llm.bind_tools(ALL_TOOLS)
+    return _llm_with_tools, _llm_fast_with_tools
+
+
+def _llm_slot():
+    """Return a context manager holding one of the process's LLM call slots.
+
+    With ``MAX_CONCURRENT_LLM_CALLS`` set, calls beyond that many queue here
+    instead of tripping the provider's rate limits (useful for eval fan-out);
+    by default calls are unbounded and this is a no-op.
+    """
+    global _llm_slots
+    if config.MAX_CONCURRENT_LLM_CALLS <= 0:
+        return contextlib.nullcontext()
+    if _llm_slots is None:
+        _llm_slots = asyncio.Semaphore(config.MAX_CONCURRENT_LLM_CALLS)
+    return _llm_slots
+
+
+def _get_verifier() -> ResponseVerifier:
+    """Return the shared ResponseVerifier, creating it on first call."""
+    global _verifier
+    if _verifier is None:
+        _verifier = ResponseVerifier()
+    return _verifier
+
+
+def _last_of_type(
+    messages: list[BaseMessage], cls: type[BaseMessage], with_content: bool = False
+) -> BaseMessage | None:
+    """Return the most recent message of type *cls*, or None.
+
+    With ``with_content``, messages with empty content (e.g. a pure
+    tool-call turn) are skipped.
+    """
+    return next(
+        (m for m in reversed(messages) if isinstance(m, cls) and (m.content or not with_content)),
+        None,
+    )
 
 
 def classify_query(state: AgentState) -> AgentState:
     """Classify the user's query type for verification routing."""
-    messages = state["messages"]
-    last_user_msg = ""
-    for msg in reversed(messages):
-        if isinstance(msg, HumanMessage):
-            last_user_msg = msg.content.lower()
-            break
-
-    query_type = "general"
-    if any(kw in last_user_msg for kw in ["dividend", "income goal", "passive income", "yield", "payout"]):
-        query_type = "dividend"
-    elif any(kw in last_user_msg for kw in ["tax", "capital gain", "deduct"]):
-        query_type = "tax"
-    elif any(kw in last_user_msg for kw in ["should i", "recommend", "suggest", "advice", "optimize"]):
-        query_type = "advice"
-    elif any(kw in last_user_msg for kw in ["compliance", "concentration", "diversif", "risk limit"]):
-        query_type = "compliance"
-
-    return {**state, "query_type": query_type}
-
-
-def call_model(state: AgentState) -> AgentState:
+    last_human = _last_of_type(state["messages"], HumanMessage)
+    last_user_msg = last_human.content if last_human is not None else ""
+
+    matched = {m.lastgroup for m in _CLASSIFIER_RE.finditer(last_user_msg)}
+    query_type = next((qt for qt in _QUERY_TYPE_KEYWORDS if qt in matched), "general")
+
+    return {"query_type": query_type}
+
+
+_LIMIT_REACHED_MESSAGE = (
+    "I've reached my reasoning limit for this query. "
+    "Here's what I found so far based on the data collected."
+)
+
+
+async def call_model(state: AgentState) -> AgentState:
     """Invoke the LLM with the current message history.
 
     Uses Haiku (fast model) for summarization passes (iteration > 0 with tool
@@ -117,68 +175,59 @@ def call_model(state: AgentState) -> AgentState:
     """
     iterations = state.get("iterations", 0)
     if iterations >= config.MAX_ITERATIONS:
-        return {
-            **state,
-            "messages": [
-                AIMessage(content="I've reached my reasoning limit for this query. Here's what I found so far based on the data collected.")
-            ],
-        }
+        return {"messages": [AIMessage(content=_LIMIT_REACHED_MESSAGE)]}
 
     # Use Haiku for summarization pass (after tools have returned results)
-    has_tool_results = len(state.get("tool_results", [])) > 0
-    use_fast = iterations > 0 and has_tool_results
+    use_fast = iterations > 0 and bool(state.get("tool_results"))
+    llm_with_tools, llm_fast_with_tools = _get_models()
     model = llm_fast_with_tools if use_fast else llm_with_tools
 
-    messages = [SystemMessage(content=SYSTEM_PROMPT)] + state["messages"]
-    response = model.invoke(messages)
+    async with _llm_slot():
+        response = await model.ainvoke([_SYSTEM_MSG, *state["messages"]])
 
-    # Accumulate token usage from response metadata, split by model
+    # Token usage from response metadata; the reducers add these to the
+    # running totals, split by model.
     usage = response.response_metadata.get("usage", {})
     input_tok = usage.get("input_tokens", 0)
     output_tok = usage.get("output_tokens", 0)
+    model_name = "haiku" if use_fast else "sonnet"
 
-    prev_input = state.get("total_input_tokens", 0)
-    prev_output = state.get("total_output_tokens", 0)
-
-    if use_fast:
-        haiku_in = state.get("haiku_input_tokens", 0) + input_tok
-        haiku_out = state.get("haiku_output_tokens", 0) + output_tok
-        sonnet_in = state.get("sonnet_input_tokens", 0)
-        sonnet_out = state.get("sonnet_output_tokens", 0)
-    else:
-        sonnet_in = state.get("sonnet_input_tokens", 0) + input_tok
-        sonnet_out = state.get("sonnet_output_tokens", 0) + output_tok
-        haiku_in = state.get("haiku_input_tokens", 0)
-        haiku_out = state.get("haiku_output_tokens", 0)
+    # Stop before another tool round-trip once the per-request token budget
+    # is spent; the usage of this call is still recorded below.
+    spent = state.get("total_input_tokens", 0) + state.get("total_output_tokens", 0) + input_tok + output_tok
+    if response.tool_calls and spent >= config.MAX_TOKENS_PER_REQUEST:
+        logger.warning("Token budget exhausted (%d >= %d) — ending agent loop", spent, config.MAX_TOKENS_PER_REQUEST)
+        response = AIMessage(content=_LIMIT_REACHED_MESSAGE)
 
     return {
-        **state,
         "messages": [response],
+        "tools_used": [tc["name"] for tc in response.tool_calls],
         "iterations": iterations + 1,
-        "total_input_tokens": prev_input + input_tok,
-        "total_output_tokens": prev_output + output_tok,
-        "model_used_last": "haiku" if use_fast else "sonnet",
-        "sonnet_input_tokens": sonnet_in,
-        "sonnet_output_tokens": sonnet_out,
-        "haiku_input_tokens": haiku_in,
-        "haiku_output_tokens": haiku_out,
+        "total_input_tokens": input_tok,
+        "total_output_tokens": output_tok,
+        "model_used_last": model_name,
+        f"{model_name}_input_tokens": input_tok,
+        f"{model_name}_output_tokens": output_tok,
     }
 
 
 def collect_tool_results(state: AgentState) -> AgentState:
-    """Extract tool results from the latest messages for verification."""
-    tool_results = list(state.get("tool_results", []))
-    for msg in state["messages"]:
-        if hasattr(msg, "content") and isinstance(msg.content, str):
-            # Tool messages contain the result as string content
+    """Extract tool results from messages added since the previous pass.
+
+    ``tool_results_cursor`` marks how far the message list has already been
+    scanned, so each tool message is parsed exactly once per run.
+    """
+    tool_results = []
+    messages = state["messages"]
+    for msg in messages[state.get("tool_results_cursor", 0):]:
+        if isinstance(msg, ToolMessage) and isinstance(msg.content, str):
             try:
-                import json
-                data = json.loads(msg.content)
+                data = orjson.loads(msg.content)
                 if isinstance(data, dict) and "status" in data:
                     tool_results.append(data)
-            except (json.JSONDecodeError, TypeError):
+            except orjson.JSONDecodeError:
                 pass
-    return {**state, "tool_results": tool_results}
+    return {"tool_results": tool_results, "tool_results_cursor": len(messages)}
 
 
 def _extract_text(content) -> str:
@@ -193,42 +242,120 @@ def _extract_text(content) -> str:
     return str(content)
 
 
+# Phrase that identifies a response which already carries the disclaimer;
+# matching a short phrase is robust to whitespace/markdown differences.
+_DISCLAIMER_MARKER = "does not constitute financial advice"
+
+# Responses shorter than this, for general queries without tool calls and
+# with nothing the verifier checks, skip verification.
+_TRIVIAL_RESPONSE_CHARS = 200
+
+# Confidence given to a skipped reply: what the verifier scores a clean
+# response when no tools ran (all checks pass, neutral tool success rate).
+_UNVERIFIED_CONFIDENCE = 0.85
+
+
 def verify_response(state: AgentState) -> AgentState:
     """Run verification checks on the agent's final response."""
-    messages = state["messages"]
-    last_ai_msg = ""
-    for msg in reversed(messages):
-        if isinstance(msg, AIMessage) and msg.content:
-            last_ai_msg = _extract_text(msg.content)
-            break
+    last_ai = _last_of_type(state["messages"], AIMessage, with_content=True)
+    last_ai_msg = _extract_text(last_ai.content) if last_ai is not None else ""
 
     if not last_ai_msg:
-        return {**state, "confidence": 0.0, "verification_passed": False}
+        return {"final_response": "", "confidence": 0.0, "verification_passed": False}
+
+    query_type = state.get("query_type", "general")
+    tool_results = state.get("tool_results", [])
+
+    # Short general replies with no tool data and no numbers, dollar amounts
+    # or directive phrasing (greetings, clarifying questions) have nothing
+    # to verify.
+    if (
+        query_type == "general"
+        and not tool_results
+        and len(last_ai_msg) < _TRIVIAL_RESPONSE_CHARS
+        and not has_checkable_claims(last_ai_msg)
+    ):
+        return {
+            "final_response": last_ai_msg,
+            "confidence": _UNVERIFIED_CONFIDENCE,
+            "verification_passed": True,
+        }
 
-    result = verifier.verify(
+    result = _get_verifier().verify(
         response_text=last_ai_msg,
-        tool_results=state.get("tool_results", []),
-        query_type=state.get("query_type", "general"),
+        tool_results=tool_results,
+        query_type=query_type,
     )
 
     # Append disclaimer for advice/tax queries
-    query_type = state.get("query_type", "general")
-    if query_type in ("tax", "advice") and DISCLAIMER_TEMPLATE.strip() not in last_ai_msg:
+    if query_type in ("tax", "advice") and _DISCLAIMER_MARKER not in last_ai_msg:
         amended = last_ai_msg + DISCLAIMER_TEMPLATE
         return {
-            **state,
             "messages": [AIMessage(content=amended)],
+            "final_response": amended,
             "confidence": result.confidence,
             "verification_passed": result.passed,
         }
 
     return {
-        **state,
+        "final_response": last_ai_msg,
         "confidence": result.confidence,
         "verification_passed": result.passed,
     }
 
 
+_TOOLS_BY_NAME = {t.name: t for t in ALL_TOOLS}
+
+
+async def _run_tool_call(tool_call: dict, run_config: RunnableConfig) -> dict:
+    """Invoke a single tool call, returning an error envelope on failure."""
+    tool = _TOOLS_BY_NAME.get(tool_call["name"])
+    if tool is None:
+        return {
+            "status": "error",
+            "data": None,
+            "message": f"Unknown tool: {tool_call['name']}",
+            "execution_time": 0.0,
+        }
+    start = time.time()
+    try:
+        return await tool.ainvoke(tool_call["args"], run_config)
+    except Exception as e:
+        logger.exception("Tool %s failed", tool_call["name"])
+        return {
+            "status": "error",
+            "data": None,
+            "message": f"{tool_call['name']} failed: {str(e)}",
+            "execution_time": round(time.time() - start, 3),
+        }
+
+
+async def parallel_tool_node(state: AgentState) -> AgentState:
+    """Execute every tool call from the last AI message concurrently.
+
+    Results are returned as ToolMessages in the order the model emitted the
+    calls, so the transcript stays deterministic. The node's run config is
+    passed through so tool callbacks reach ``astream_events``. It is read
+    with ``get_config`` rather than injected as a ``config`` parameter,
+    which would shadow the agent config in this module.
+    """
+    run_config = get_config()
+    tool_calls = state["messages"][-1].tool_calls
+    results = await asyncio.gather(*(_run_tool_call(tc, run_config) for tc in tool_calls))
+    return {
+        "messages": [
+            ToolMessage(
+                content=result if isinstance(result, str) else orjson.dumps(
+                    result, default=str, option=orjson.OPT_NON_STR_KEYS
+                ).decode(),
+                tool_call_id=tc["id"],
+                name=tc["name"],
+            )
+            for tc, result in zip(tool_calls, results)
+        ]
+    }
+
+
 def should_continue(state: AgentState) -> str:
     """Route: if the last message has tool calls, go to tools; otherwise verify."""
     messages = state["messages"]
@@ -239,60 +366,72 @@ def should_continue(state: AgentState) -> str:
     return "verify"
 
 
-# Build the graph
-tool_node = ToolNode(ALL_TOOLS)
+# The graph is compiled on first use, like the models, so importing this
+# module does not pay for graph construction.
+_agent_graph = None
 
-graph_builder = StateGraph(AgentState)
-graph_builder.add_node("classify", classify_query)
-graph_builder.add_node("agent", call_model)
-graph_builder.add_node("tools", tool_node)
-graph_builder.add_node("collect", collect_tool_results)
-graph_builder.add_node("verify", verify_response)
 
-graph_builder.set_entry_point("classify")
-graph_builder.add_edge("classify", "agent")
-graph_builder.add_conditional_edges("agent", should_continue, {"tools": "tools", "verify": "verify"})
-graph_builder.add_edge("tools", "collect")
-graph_builder.add_edge("collect", "agent")
-graph_builder.add_edge("verify", END)
+def _get_graph():
+    """Return the compiled agent graph, building it on first call."""
+    global _agent_graph
+    if _agent_graph is None:
+        graph_builder = StateGraph(AgentState)
+        graph_builder.add_node("classify", classify_query)
+        graph_builder.add_node("agent", call_model)
+        graph_builder.add_node("tools", parallel_tool_node)
+        graph_builder.add_node("collect", collect_tool_results)
+        graph_builder.add_node("verify", verify_response)
 
-agent_graph = graph_builder.compile()
+        graph_builder.set_entry_point("classify")
+        graph_builder.add_edge("classify", "agent")
+        graph_builder.add_conditional_edges("agent", should_continue, {"tools": "tools", "verify": "verify"})
+        graph_builder.add_edge("tools", "collect")
+        graph_builder.add_edge("collect", "agent")
+        graph_builder.add_edge("verify", END)
 
+        _agent_graph = graph_builder.compile()
+    return _agent_graph
 
-# In-memory conversation store (swap for Redis/DB in production)
-_conversations: dict[str, list[BaseMessage]] = {}
 
+def warmup() -> None:
+    """Build the chat models, verifier and compiled graph ahead of time.
 
-async def run_agent(
-    message: str,
-    conversation_id: str | None = None,
-    ghostfolio_token: str | None = None,
-) -> dict:
-    """Run the agent graph and return the response."""
-    if not message or not message.strip():
-        return {
-            "response": "It looks like you sent an empty message. How can I help you with your portfolio today?",
-            "conversation_id": conversation_id or str(uuid.uuid4()),
-            "tools_used": [],
-            "confidence": 0.0,
-            "metrics": AgentMetrics(task_id=f"chat_{int(time.time())}").to_dict(),
-            "trace_id": "",
-        }
+    Everything here is otherwise created lazily by the first run; callers
+    about to fan out many concurrent runs call this once so the first wave
+    does not all start cold. Makes no LLM or network calls.
+    """
+    _get_models()
+    _get_verifier()
+    _get_graph()
 
-    conversation_id = conversation_id or str(uuid.uuid4())
-    trace_id = uuid.uuid4().hex
-    history = _conversations.get(conversation_id, [])
-    history.append(HumanMessage(content=message))
-    history_len = len(history)  # track where new messages start
 
-    metrics = AgentMetrics(task_id=f"chat_{int(time.time())}")
+def _empty_message_result(conversation_id: str | None) -> dict:
+    """Response returned without running the graph when the message is blank."""
+    return {
+        "response": "It looks like you sent an empty message. How can I help you with your portfolio today?",
+        "conversation_id": conversation_id or str(uuid.uuid4()),
+        "tools_used": [],
+        "confidence": 0.0,
+        "metrics": AgentMetrics(task_id=f"chat_{int(time.time())}").to_dict(),
+        "trace_id": "",
+        "tool_results": [],
+    }
+
+
+async def _prepare_run(message: str, conversation_id: str) -> AgentState:
+    """Load history, append the user message, and build the initial graph state."""
+    history = await memory.get_history(conversation_id)
+    history.append(HumanMessage(content=message))
 
     initial_state: AgentState = {
         "messages": history,
         "tool_results": [],
+        "tool_results_cursor": 0,
+        "tools_used": [],
         "iterations": 0,
         "confidence": 0.0,
         "verification_passed": False,
+        "final_response": "",
         "query_type": "general",
         "metrics": {},
         "total_input_tokens": 0,
@@ -303,25 +442,24 @@ async def run_agent(
         "haiku_input_tokens": 0,
         "haiku_output_tokens": 0,
     }
+    return initial_state
 
-    # Run the graph
-    final_state = await agent_graph.ainvoke(initial_state)
 
-    # Extract response
-    response_text = ""
-    for msg in reversed(final_state["messages"]):
-        if isinstance(msg, AIMessage) and msg.content and not msg.tool_calls:
-            response_text = _extract_text(msg.content)
-            break
+async def _finalize_run(
+    message: str,
+    conversation_id: str,
+    trace_id: str,
+    final_state: AgentState,
+    metrics: AgentMetrics,
+) -> dict:
+    """Persist history, record metrics and tracing, and build the response payload."""
+    # verify_response (the terminal node) records the final answer, and
+    # call_model accumulated the tools used.
+    response_text = final_state.get("final_response", "")
+    tools_used = final_state.get("tools_used", [])
 
     # Update conversation history
-    _conversations[conversation_id] = final_state["messages"]
-
-    # Collect tools used (only from this turn, not prior conversation history)
-    tools_used = []
-    for msg in final_state["messages"][history_len:]:
-        if isinstance(msg, AIMessage) and msg.tool_calls:
-            tools_used.extend(tc["name"] for tc in msg.tool_calls)
+    await memory.set_history(conversation_id, final_state["messages"])
 
     # Populate token usage and cost from accumulated state
     input_tokens = final_state.get("total_input_tokens", 0)
@@ -346,8 +484,8 @@ async def run_agent(
     metrics.total_tokens = input_tokens + output_tokens
     metrics.total_cost_usd = cost
 
-    # Trace to Langfuse — fire-and-forget to avoid blocking the response
-    asyncio.create_task(_trace_in_background(
+    # Trace to Langfuse — queued for a background worker to avoid blocking the response
+    enqueue_trace(
         conversation_id=conversation_id,
         input_message=message,
         output_message=response_text,
@@ -355,12 +493,12 @@ async def run_agent(
         confidence=final_state.get("confidence", 0.0),
         metrics=metrics.to_dict(),
         trace_id=trace_id,
-    ))
+    )
 
     return {
         "response": response_text,
         "conversation_id": conversation_id,
-        "tools_used": list(set(tools_used)),
+        "tools_used": list(dict.fromkeys(tools_used)),
         "confidence": final_state.get("confidence", 0.0),
         "metrics": metrics.to_dict(),
         "trace_id": trace_id,
@@ -368,6 +506,25 @@ async def run_agent(
     }
 
 
+async def run_agent(
+    message: str,
+    conversation_id: str | None = None,
+    ghostfolio_token: str | None = None,
+) -> dict:
+    """Run the agent graph and return the response."""
+    if not message or not message.strip():
+        return _empty_message_result(conversation_id)
+
+    conversation_id = conversation_id or str(uuid.uuid4())
+    trace_id = uuid.uuid4().hex
+    metrics = AgentMetrics(task_id=f"chat_{int(time.time())}")
+    initial_state = await _prepare_run(message, conversation_id)
+
+    final_state = await _get_graph().ainvoke(initial_state)
+
+    return await _finalize_run(message, conversation_id, trace_id, final_state, metrics)
+
+
 async def stream_agent(
     message: str,
     conversation_id: str | None = None,
@@ -375,38 +532,45 @@ async def stream_agent(
 ) -> AsyncGenerator[dict, None]:
     """Stream agent response as SSE-friendly dicts.
 
-    Delegates to run_agent() and emits the full response as SSE events.
-    This ensures full compatibility with the multi-node LangGraph pipeline
-    (classify → agent → tools → collect → verify) which doesn't support
-    reliable mid-graph token streaming.
+    Uses ``astream_events`` so LLM tokens from the ``agent`` node are
+    forwarded as they are generated, with ``tool_start``/``tool_end`` events
+    around each tool call. Verification may amend the answer (e.g. append a
+    disclaimer), so the final ``done`` event carries the authoritative
+    ``response`` along with the same metadata ``run_agent`` returns.
     """
     try:
-        result = await run_agent(
-            message=message,
-            conversation_id=conversation_id,
-            ghostfolio_token=ghostfolio_token,
-        )
-
-        # Emit the full response as a single token event
-        if result.get("response"):
+        if not message or not message.strip():
+            result = _empty_message_result(conversation_id)
             yield {"type": "token", "data": {"content": result["response"]}}
-
-        # Emit tool usage
-        for tool in result.get("tools_used", []):
-            yield {"type": "tool_start", "data": {"tool": tool}}
-
-        # Emit done with all metadata
-        yield {
-            "type": "done",
-            "data": {
-                "conversation_id": result.get("conversation_id", ""),
-                "trace_id": result.get("trace_id", ""),
-                "tools_used": result.get("tools_used", []),
-                "confidence": result.get("confidence", 0.0),
-                "metrics": result.get("metrics", {}),
-                "tool_results": result.get("tool_results", []),
-            },
-        }
+            yield {"type": "done", "data": result}
+            return
+
+        conversation_id = conversation_id or str(uuid.uuid4())
+        trace_id = uuid.uuid4().hex
+        metrics = AgentMetrics(task_id=f"chat_{int(time.time())}")
+        initial_state = await _prepare_run(message, conversation_id)
+
+        final_state = None
+        async for event in _get_graph().astream_events(initial_state, version="v2"):
+            kind = event["event"]
+            if kind == "on_chat_model_stream":
+                if event["metadata"].get("langgraph_node") != "agent":
+                    continue
+                text = _extract_text(event["data"]["chunk"].content)
+                if text:
+                    yield {"type": "token", "data": {"content": text}}
+            elif kind == "on_tool_start":
+                yield {"type": "tool_start", "data": {"tool": event["name"]}}
+            elif kind == "on_tool_end":
+                yield {"type": "tool_end", "data": {"tool": event["name"]}}
+            elif kind == "on_chain_end" and not event["parent_ids"]:
+                final_state = event["data"]["output"]
+
+        if final_state is None:
+            raise RuntimeError("Agent graph finished without a final state")
+
+        result = await _finalize_run(message, conversation_id, trace_id, final_state, metrics)
+        yield {"type": "done", "data": result}
     except Exception as e:
         logger.exception("Streaming agent error")
         yield {"type": "error", "data": {"message": str(e)}}
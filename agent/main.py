@@ -1,5 +1,6 @@
 """AgentForge — FastAPI entry point for the financial AI agent."""
 
+import logging
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
@@ -7,18 +8,30 @@ from dotenv import load_dotenv
 # Load .env BEFORE any other agent imports so env vars are available
 load_dotenv()
 
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from agent.ghostfolio_client import GhostfolioClient
 from agent.router import router as agent_router
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan: startup and shutdown."""
-    from agent.database import init_db
-    init_db()
+    from agent.database import close_db, init_db
+    await init_db()
     yield
+    from agent import memory, observability
+    # Queued traces go out first; each step is guarded so one failing close
+    # cannot skip the rest.
+    for shutdown_step in (observability.flush, close_db, GhostfolioClient.close, memory.close):
+        try:
+            await shutdown_step()
+        except Exception:
+            logger.exception("Shutdown step %s failed", shutdown_step.__qualname__)
 
 
 app = FastAPI(
@@ -40,5 +53,10 @@ app.include_router(agent_router, prefix="/api/agent")
 
 
 @app.get("/health")
-async def health():
-    return {"status": "ok", "service": "agentforge"}
+async def health() -> Response:
+    body = {
+        "status": "ok",
+        "service": "agentforge",
+        "market_data_cache": GhostfolioClient.get_symbol.cache_info(),
+    }
+    return Response(content=orjson.dumps(body), media_type="application/json")
@@ -0,0 +1,90 @@
+"""Conversation history store: Redis when configured, in-process LRU otherwise."""
+
+import logging
+from collections import OrderedDict
+
+import orjson
+from langchain_core.messages import BaseMessage, HumanMessage, messages_from_dict, messages_to_dict
+
+from agent.config import config
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "agentforge:conversation:"
+
+# Redis client is created on first use so the in-memory fallback never
+# needs the redis package installed.
+_redis = None
+
+# Fallback store used when REDIS_URL is unset: bounded LRU, per process.
+_conversations: OrderedDict[str, list[BaseMessage]] = OrderedDict()
+
+
+def _get_redis():
+    """Return the shared async Redis client, or None if Redis is not configured."""
+    global _redis
+    if _redis is None and config.REDIS_URL:
+        from redis.asyncio import Redis
+
+        _redis = Redis.from_url(config.REDIS_URL)
+    return _redis
+
+
+def _truncate(messages: list[BaseMessage]) -> list[BaseMessage]:
+    """Keep at most ``MAX_HISTORY_MESSAGES`` messages, cut at a user turn.
+
+    Cutting at a HumanMessage ensures a tool call is never separated from its
+    result.
+    """
+    cut = len(messages) - config.MAX_HISTORY_MESSAGES
+    if cut <= 0:
+        return messages
+    turn_starts = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+    start = next((i for i in turn_starts if i >= cut), turn_starts[-1] if turn_starts else 0)
+    return messages[start:]
+
+
+async def get_history(conversation_id: str) -> list[BaseMessage]:
+    """Return a copy of the stored history for *conversation_id* (empty if unknown)."""
+    redis = _get_redis()
+    if redis is not None:
+        raw = await redis.hget(_KEY_PREFIX + conversation_id, "messages")
+        return messages_from_dict(orjson.loads(raw)) if raw else []
+
+    history = _conversations.get(conversation_id)
+    if history is None:
+        return []
+    _conversations.move_to_end(conversation_id)
+    return list(history)
+
+
+async def set_history(conversation_id: str, messages: list[BaseMessage]) -> None:
+    """Store *messages* as the latest history for *conversation_id*.
+
+    Redis entries expire after ``CONVERSATION_TTL_SECONDS``; the in-memory
+    store evicts the least recently used conversations instead.
+    """
+    messages = _truncate(messages)
+
+    redis = _get_redis()
+    if redis is not None:
+        key = _KEY_PREFIX + conversation_id
+        payload = orjson.dumps(messages_to_dict(messages), default=str)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, "messages", payload)
+            pipe.expire(key, config.CONVERSATION_TTL_SECONDS)
+            await pipe.execute()
+        return
+
+    _conversations[conversation_id] = messages
+    _conversations.move_to_end(conversation_id)
+    while len(_conversations) > config.MAX_CONVERSATIONS:
+        _conversations.popitem(last=False)
+
+
+async def close() -> None:
+    """Close the Redis connection pool, if one was opened."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
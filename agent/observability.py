@@ -1,42 +1,68 @@
 """Langfuse observability integration for trace logging, cost tracking, and eval scores."""
 
+import asyncio
+import functools
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from agent.config import config
 
 logger = logging.getLogger(__name__)
 
 _langfuse = None
+_langfuse_disabled = False
+_TRACE_MODEL = os.getenv("AGENT_MODEL", config.PRIMARY_MODEL)
+
+# Traces and scores are handed to a single consumer task that runs the
+# blocking Langfuse calls on a small shared thread pool, instead of one
+# thread per request.
+TRACE_QUEUE_MAXSIZE = 1000
+
+# Let the Langfuse SDK batch events in the background instead of flushing
+# per request; ``flush()`` drains whatever is left at shutdown.
+LANGFUSE_FLUSH_AT = 50
+LANGFUSE_FLUSH_INTERVAL = 5.0
+SHUTDOWN_DRAIN_TIMEOUT = 10.0
+
+_trace_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="langfuse")
+_trace_queue: asyncio.Queue | None = None
+_trace_worker: asyncio.Task | None = None
 
 
 def _get_langfuse():
-    """Lazy-initialize Langfuse client."""
-    global _langfuse
-    if _langfuse is not None:
+    """Lazy-initialize Langfuse client.
+
+    Credentials come from ``config``, read once at import. A failed or
+    unconfigured setup is remembered so later calls return immediately
+    instead of re-checking and re-logging on every request.
+    """
+    global _langfuse, _langfuse_disabled
+    if _langfuse is not None or _langfuse_disabled:
         return _langfuse
 
-    public_key = os.getenv("LANGFUSE_PUBLIC_KEY", "")
-    secret_key = os.getenv("LANGFUSE_SECRET_KEY", "")
-    host = os.getenv("LANGFUSE_HOST") or os.getenv("LANGFUSE_BASE_URL", "https://us.cloud.langfuse.com")
-
-    if not public_key or not secret_key:
+    if not config.LANGFUSE_PUBLIC_KEY or not config.LANGFUSE_SECRET_KEY:
         logger.warning("Langfuse keys not configured — observability disabled")
+        _langfuse_disabled = True
         return None
 
     try:
         from langfuse import Langfuse
 
         _langfuse = Langfuse(
-            public_key=public_key,
-            secret_key=secret_key,
-            host=host,
+            public_key=config.LANGFUSE_PUBLIC_KEY,
+            secret_key=config.LANGFUSE_SECRET_KEY,
+            host=config.LANGFUSE_HOST,
+            flush_at=LANGFUSE_FLUSH_AT,
+            flush_interval=LANGFUSE_FLUSH_INTERVAL,
         )
         return _langfuse
     except ImportError:
         logger.warning("langfuse package not installed — observability disabled")
-        return None
     except Exception as e:
         logger.warning(f"Failed to initialize Langfuse: {e}")
-        return None
+    _langfuse_disabled = True
+    return None
 
 
 def trace_agent_run(
@@ -74,7 +100,7 @@ def trace_agent_run(
         total_tokens = metrics.get("total_tokens", 0)
         gen = span.start_generation(
             name="agent-response",
-            model=os.getenv("AGENT_MODEL", "claude-sonnet-4-6"),
+            model=_TRACE_MODEL,
             input=input_message,
             output=output_message,
             usage_details={"total": total_tokens} if total_tokens else None,
@@ -90,11 +116,71 @@ def trace_agent_run(
         )
 
         span.end()
-        client.flush()
     except Exception as e:
         logger.warning(f"Failed to log trace to Langfuse: {e}")
 
 
+async def _consume_traces(queue: asyncio.Queue) -> None:
+    """Drain *queue*, running each ``(func, payload)`` job on the trace executor."""
+    loop = asyncio.get_running_loop()
+    while True:
+        func, payload = await queue.get()
+        try:
+            await loop.run_in_executor(_trace_executor, functools.partial(func, **payload))
+        except Exception as e:
+            logger.warning(f"Background Langfuse {func.__name__} failed: {e}")
+        finally:
+            queue.task_done()
+
+
+def _enqueue(func, payload: dict) -> bool:
+    """Queue ``func(**payload)`` for the background worker, starting it if needed.
+
+    Must be called from a running event loop. Returns False (with a warning)
+    when the queue is full rather than applying backpressure to requests.
+    """
+    global _trace_queue, _trace_worker
+    loop = asyncio.get_running_loop()
+    if _trace_worker is None or _trace_worker.done() or _trace_worker.get_loop() is not loop:
+        _trace_queue = asyncio.Queue(maxsize=TRACE_QUEUE_MAXSIZE)
+        _trace_worker = loop.create_task(_consume_traces(_trace_queue))
+
+    try:
+        _trace_queue.put_nowait((func, payload))
+        return True
+    except asyncio.QueueFull:
+        logger.warning("Langfuse queue full — dropping %s for trace %s", func.__name__, payload.get("trace_id"))
+        return False
+
+
+def enqueue_trace(**payload) -> bool:
+    """Queue an agent run for ``trace_agent_run`` without blocking the caller."""
+    return _enqueue(trace_agent_run, payload)
+
+
+def enqueue_score(**payload) -> bool:
+    """Queue a ``score_trace`` call (e.g. user feedback) without blocking the caller."""
+    return _enqueue(score_trace, payload)
+
+
+async def flush() -> None:
+    """Drain queued traces and flush buffered Langfuse events.
+
+    Call once on application shutdown so batched traces are not lost.
+    """
+    global _trace_worker
+    if _trace_worker is not None and not _trace_worker.done():
+        try:
+            await asyncio.wait_for(_trace_queue.join(), timeout=SHUTDOWN_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out draining Langfuse queue — %d jobs dropped", _trace_queue.qsize())
+        _trace_worker.cancel()
+        _trace_worker = None
+
+    if _langfuse is not None:
+        await asyncio.get_running_loop().run_in_executor(_trace_executor, _langfuse.flush)
+
+
 def score_trace(
     trace_id: str,
     score_name: str,
@@ -113,6 +199,5 @@ def score_trace(
             value=value,
             comment=comment,
         )
-        client.flush()
     except Exception as e:
         logger.warning(f"Failed to score trace: {e}")
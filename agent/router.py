@@ -1,20 +1,38 @@
 """API router for agent endpoints."""
 
 import asyncio
-import json
+import logging
+from typing import AsyncGenerator
 
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from agent.database import create_goal, delete_goal, get_goals, update_goal
 from agent.graph import run_agent, stream_agent
-from agent.observability import score_trace
+from agent.observability import enqueue_score
 from agent.tools import ALL_TOOLS
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
+def _json_response(payload, status_code: int = 200) -> Response:
+    """Encode *payload* with orjson into a ready-made JSON ``Response``.
+
+    Handlers whose data already matches their ``response_model`` return this
+    so FastAPI skips revalidating and re-serializing it; the model is still
+    used for the OpenAPI schema.
+    """
+    return Response(
+        content=orjson.dumps(payload, default=str),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
 class ChatRequest(BaseModel):
     message: str
     conversation_id: str | None = None
@@ -31,8 +49,23 @@ class ChatResponse(BaseModel):
     tool_results: list[dict] = []
 
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+# Smallest JSON body that can carry a non-empty message: {"message":"x"}.
+_MIN_CHAT_BODY_BYTES = 15
+
+
+async def _reject_empty(request: Request) -> None:
+    """Reject chat requests whose body is too short to hold a message.
+
+    Dependencies are solved before the body is validated into ``ChatRequest``,
+    so empty or trivially small payloads fail without building the model.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) < _MIN_CHAT_BODY_BYTES:
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+
+
+@router.post("/chat", response_model=ChatResponse, dependencies=[Depends(_reject_empty)])
+async def chat(request: ChatRequest) -> Response:
     """Send a message to the AgentForge financial agent."""
     if not request.message or not request.message.strip():
         raise HTTPException(status_code=400, detail="Message cannot be empty")
@@ -42,32 +75,84 @@ async def chat(request: ChatRequest):
             conversation_id=request.conversation_id,
             ghostfolio_token=request.ghostfolio_token,
         )
-        return result
+        return _json_response(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/chat-stream")
+# SSE frames are coalesced before being handed to the ASGI server: a chunk is
+# sent once it reaches SSE_FLUSH_BYTES, when a lifecycle event arrives, or
+# after SSE_FLUSH_INTERVAL seconds without one, which bounds added latency.
+SSE_FLUSH_BYTES = 4096
+SSE_FLUSH_INTERVAL = 0.05
+_SSE_FLUSH_EVENTS = frozenset({"tool_start", "tool_end", "done", "error"})
+
+
+def _sse_frame(event_type: str, data: dict) -> bytes:
+    """Encode one Server-Sent Event as bytes, ready for StreamingResponse."""
+    return b"event: %s\ndata: %s\n\n" % (event_type.encode(), orjson.dumps(data, default=str))
+
+
+async def _coalesce_sse(events: AsyncGenerator[dict, None]) -> AsyncGenerator[bytes, None]:
+    """Encode *events* as SSE frames, batching them into fewer, larger chunks.
+
+    *events* is closed when this generator finishes or is closed (e.g. on
+    client disconnect), so its cleanup never waits on the garbage collector.
+    """
+    buf = bytearray()
+    pending: asyncio.Future | None = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(events))
+            done, _ = await asyncio.wait({pending}, timeout=SSE_FLUSH_INTERVAL if buf else None)
+            if not done:
+                yield bytes(buf)
+                buf.clear()
+                continue
+
+            fut, pending = pending, None
+            try:
+                event = fut.result()
+            except StopAsyncIteration:
+                break
+
+            event_type = event.get("type", "token")
+            buf += _sse_frame(event_type, event.get("data", {}))
+            if len(buf) >= SSE_FLUSH_BYTES or event_type in _SSE_FLUSH_EVENTS:
+                yield bytes(buf)
+                buf.clear()
+    except Exception as e:
+        buf += _sse_frame("error", {"message": str(e)})
+    finally:
+        if pending is not None:
+            pending.cancel()
+            # aclose() refuses a generator that is still mid-step
+            await asyncio.wait({pending})
+        try:
+            await events.aclose()
+        except Exception:
+            logger.exception("Error closing agent event stream")
+    if buf:
+        yield bytes(buf)
+
+
+@router.post("/chat-stream", dependencies=[Depends(_reject_empty)])
 async def chat_stream(request: ChatRequest):
     """Stream agent response as Server-Sent Events."""
     if not request.message or not request.message.strip():
         raise HTTPException(status_code=400, detail="Message cannot be empty")
 
-    async def event_generator():
-        try:
-            async for event in stream_agent(
-                message=request.message,
-                conversation_id=request.conversation_id,
-                ghostfolio_token=request.ghostfolio_token,
-            ):
-                event_type = event.get("type", "token")
-                event_data = json.dumps(event.get("data", {}))
-                yield f"event: {event_type}\ndata: {event_data}\n\n"
-        except Exception as e:
-            yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
+    event_generator = _coalesce_sse(
+        stream_agent(
+            message=request.message,
+            conversation_id=request.conversation_id,
+            ghostfolio_token=request.ghostfolio_token,
+        )
+    )
 
     return StreamingResponse(
-        event_generator(),
+        event_generator,
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -85,13 +170,19 @@ class ToolsResponse(BaseModel):
     tools: list[ToolInfo]
 
 
+# ALL_TOOLS is fixed at import, so the /tools body is serialized once. A new
+# Response wraps it per request because middleware mutates response headers.
+_TOOLS_BODY = orjson.dumps(
+    ToolsResponse(
+        tools=[ToolInfo(name=t.name, description=t.description) for t in ALL_TOOLS]
+    ).model_dump()
+)
+
+
 @router.get("/tools", response_model=ToolsResponse)
-async def list_tools():
+async def list_tools() -> Response:
     """Return all available agent tools with their names and descriptions."""
-    tools = [
-        ToolInfo(name=t.name, description=t.description) for t in ALL_TOOLS
-    ]
-    return ToolsResponse(tools=tools)
+    return Response(content=_TOOLS_BODY, media_type="application/json")
 
 
 class FeedbackRequest(BaseModel):
@@ -100,13 +191,16 @@ class FeedbackRequest(BaseModel):
     comment: str = ""
 
 
-@router.post("/feedback")
-async def submit_feedback(request: FeedbackRequest):
-    """Submit user feedback (thumbs up/down) for an agent response."""
+@router.post("/feedback", status_code=202)
+async def submit_feedback(request: FeedbackRequest) -> dict[str, str]:
+    """Submit user feedback (thumbs up/down) for an agent response.
+
+    The score is queued for the background Langfuse worker, so the request
+    returns 202 without waiting on the upload.
+    """
     if request.score not in (0.0, 1.0):
         raise HTTPException(status_code=400, detail="Score must be 0 or 1")
-    await asyncio.to_thread(
-        score_trace,
+    enqueue_score(
         trace_id=request.trace_id,
         score_name="user-feedback",
         value=request.score,
@@ -115,9 +209,12 @@ async def submit_feedback(request: FeedbackRequest):
     return {"status": "ok"}
 
 
+_HEALTH_BODY = orjson.dumps({"status": "ok", "agent": "agentforge"})
+
+
 @router.get("/health")
-async def agent_health():
-    return {"status": "ok", "agent": "agentforge"}
+async def agent_health() -> Response:
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # ---------------------------------------------------------------------------
@@ -152,44 +249,42 @@ class DividendGoalResponse(BaseModel):
 
 
 @router.get("/dividend-goals", response_model=list[DividendGoalResponse])
-async def list_dividend_goals():
+async def list_dividend_goals() -> Response:
     """List all dividend income goals."""
-    goals = await asyncio.to_thread(get_goals)
-    return goals
+    return _json_response(await get_goals())
 
 
 @router.post("/dividend-goals", response_model=DividendGoalResponse, status_code=201)
-async def create_dividend_goal(body: DividendGoalCreate):
+async def create_dividend_goal(body: DividendGoalCreate) -> Response:
     """Create a new dividend income goal."""
     if body.target_monthly <= 0 and body.target_annual <= 0:
         raise HTTPException(status_code=400, detail="Provide a target_monthly or target_annual > 0")
-    goal = await asyncio.to_thread(
-        create_goal,
+    goal = await create_goal(
         target_monthly=body.target_monthly,
         target_annual=body.target_annual,
         currency=body.currency,
         deadline=body.deadline,
         notes=body.notes,
     )
-    return goal
+    return _json_response(goal, status_code=201)
 
 
 @router.put("/dividend-goals/{goal_id}", response_model=DividendGoalResponse)
-async def update_dividend_goal(goal_id: str, body: DividendGoalUpdate):
+async def update_dividend_goal(goal_id: str, body: DividendGoalUpdate) -> Response:
     """Update an existing dividend income goal."""
     kwargs = {k: v for k, v in body.model_dump().items() if v is not None}
     if not kwargs:
         raise HTTPException(status_code=400, detail="No fields to update")
-    updated = await asyncio.to_thread(update_goal, goal_id, **kwargs)
+    updated = await update_goal(goal_id, **kwargs)
     if not updated:
         raise HTTPException(status_code=404, detail="Goal not found")
-    return updated
+    return _json_response(updated)
 
 
 @router.delete("/dividend-goals/{goal_id}")
-async def delete_dividend_goal(goal_id: str):
+async def delete_dividend_goal(goal_id: str) -> dict[str, str]:
     """Delete a dividend income goal."""
-    deleted = await asyncio.to_thread(delete_goal, goal_id)
+    deleted = await delete_goal(goal_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Goal not found")
     return {"status": "ok", "deleted": goal_id}
@@ -0,0 +1,18 @@
+"""Shared client instances for the agent tools."""
+
+import functools
+
+from agent.dividend_client import DividendClient
+from agent.ghostfolio_client import GhostfolioClient
+
+
+@functools.lru_cache(maxsize=None)
+def get_gf_client(token: str | None = None) -> GhostfolioClient:
+    """Return the GhostfolioClient for *token* (default: configured token), created once."""
+    return GhostfolioClient(token)
+
+
+@functools.lru_cache(maxsize=1)
+def get_dividend_client() -> DividendClient:
+    """Return the shared DividendClient."""
+    return DividendClient()
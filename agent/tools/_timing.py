@@ -0,0 +1,10 @@
+"""Execution-time bookkeeping for the tool result envelope."""
+
+import time
+
+now_ns = time.perf_counter_ns
+
+
+def elapsed_s(start_ns: int) -> float:
+    """Seconds since *start_ns* (from ``now_ns()``), truncated to milliseconds."""
+    return (time.perf_counter_ns() - start_ns) // 1_000_000 / 1000
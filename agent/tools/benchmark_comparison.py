@@ -1,10 +1,17 @@
 """Tool: Compare portfolio performance against benchmarks."""
 
-import time
+import asyncio
 
 from langchain_core.tools import tool
 
-from agent.ghostfolio_client import GhostfolioClient
+from agent.tools._clients import get_gf_client
+from agent.tools._timing import elapsed_s, now_ns
+
+
+def _benchmark_return(benchmark: dict, date_range: str) -> float | None:
+    """Return the benchmark's performance for *date_range*, falling back to YTD."""
+    performances = benchmark.get("performances") or {}
+    return performances.get(date_range, performances.get("ytd"))
 
 
 @tool
@@ -19,56 +26,48 @@ async def benchmark_comparison(
         date_range: Period to compare: '1m', '3m', '6m', 'ytd', '1y', '3y',
                     '5y', 'max'. Defaults to 'ytd'.
     """
-    start = time.time()
-    client = GhostfolioClient()
+    start = now_ns()
+    client = get_gf_client()
 
     try:
-        # Get portfolio performance
-        perf = await client.get_portfolio_performance(date_range=date_range)
+        # Portfolio performance and benchmarks are independent requests
+        perf, benchmarks = await asyncio.gather(
+            client.get_portfolio_performance(date_range=date_range),
+            client.get_benchmarks(),
+        )
         portfolio_perf = perf.get("performance", {})
         portfolio_return = portfolio_perf.get("netPerformancePercentage", 0)
 
-        # Get benchmarks
-        benchmarks = await client.get_benchmarks()
         benchmark_list = benchmarks if isinstance(benchmarks, list) else benchmarks.get("benchmarks", [])
 
-        comparisons = []
-        for bm in benchmark_list:
-            bm_name = bm.get("name", "Unknown")
-            bm_perf = bm.get("performances", {})
-
-            # Find the matching date range performance
-            bm_return = None
-            if date_range in bm_perf:
-                bm_return = bm_perf[date_range]
-            elif "ytd" in bm_perf:
-                bm_return = bm_perf["ytd"]
-
-            if bm_return is not None:
-                diff = portfolio_return - bm_return
-                comparisons.append({
-                    "benchmark": bm_name,
-                    "benchmark_return_pct": round(bm_return * 100, 2),
-                    "portfolio_return_pct": round(portfolio_return * 100, 2),
-                    "difference_pct": round(diff * 100, 2),
-                    "outperforming": diff > 0,
-                })
+        portfolio_return_pct = round(portfolio_return * 100, 2)
+        comparisons = [
+            {
+                "benchmark": bm.get("name", "Unknown"),
+                "benchmark_return_pct": round(bm_return * 100, 2),
+                "portfolio_return_pct": portfolio_return_pct,
+                "difference_pct": round((portfolio_return - bm_return) * 100, 2),
+                "outperforming": portfolio_return > bm_return,
+            }
+            for bm in benchmark_list
+            if (bm_return := _benchmark_return(bm, date_range)) is not None
+        ]
 
         return {
             "status": "success",
             "data": {
                 "date_range": date_range,
-                "portfolio_return_pct": round(portfolio_return * 100, 2),
+                "portfolio_return_pct": portfolio_return_pct,
                 "comparisons": comparisons,
                 "benchmarks_available": len(benchmark_list),
             },
             "message": f"Portfolio: {portfolio_return * 100:.2f}% ({date_range}) vs {len(comparisons)} benchmark(s)",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
     except Exception as e:
         return {
             "status": "error",
             "data": None,
             "message": f"Failed benchmark comparison: {str(e)}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
@@ -1,10 +1,11 @@
 """Tool: Check portfolio against diversification and concentration rules."""
 
-import time
+from collections import defaultdict
 
 from langchain_core.tools import tool
 
-from agent.ghostfolio_client import GhostfolioClient
+from agent.tools._clients import get_gf_client
+from agent.tools._timing import elapsed_s, now_ns
 
 
 # Default concentration thresholds
@@ -29,8 +30,8 @@ async def compliance_check(
         single_sector_limit: Max percentage for a single sector (default 40%).
         single_asset_class_limit: Max percentage for a single asset class (default 60%).
     """
-    start = time.time()
-    client = GhostfolioClient()
+    start = now_ns()
+    client = get_gf_client()
 
     try:
         details = await client.get_portfolio_details()
@@ -40,9 +41,14 @@ async def compliance_check(
         warnings = []
         passes = []
 
-        # Check 1: Single holding concentration
+        # Single pass over holdings: check single-holding concentration and
+        # accumulate asset-class and sector totals for checks 2 and 3.
+        asset_class_totals = defaultdict(float)
+        sector_totals = defaultdict(float)
         for key, holding in holdings.items():
             alloc_pct = holding.get("allocationInPercentage", 0) * 100
+
+            # Check 1: Single holding concentration
             name = holding.get("name", key)
             if alloc_pct > single_holding_limit:
                 violations.append({
@@ -57,37 +63,31 @@ async def compliance_check(
                     "severity": "MEDIUM",
                 })
 
+            asset_class_totals[holding.get("assetClass", "Unknown")] += alloc_pct
+            for sector in holding.get("sectors", ()):
+                sector_totals[sector.get("name", "Unknown")] += sector.get("weight", 0) * alloc_pct
+
         # Check 2: Asset class concentration
-        asset_class_totals = {}
-        for holding in holdings.values():
-            ac = holding.get("assetClass", "Unknown")
-            alloc = holding.get("allocationInPercentage", 0) * 100
-            asset_class_totals[ac] = asset_class_totals.get(ac, 0) + alloc
-
-        for ac, total in asset_class_totals.items():
-            if total > single_asset_class_limit:
-                violations.append({
-                    "rule": "Asset Class Concentration",
-                    "detail": f"{ac} is {total:.1f}% (limit: {single_asset_class_limit}%)",
-                    "severity": "MEDIUM",
-                })
+        violations.extend(
+            {
+                "rule": "Asset Class Concentration",
+                "detail": f"{ac} is {total:.1f}% (limit: {single_asset_class_limit}%)",
+                "severity": "MEDIUM",
+            }
+            for ac, total in asset_class_totals.items()
+            if total > single_asset_class_limit
+        )
 
         # Check 3: Sector concentration
-        sector_totals = {}
-        for holding in holdings.values():
-            alloc = holding.get("allocationInPercentage", 0)
-            for sector in holding.get("sectors", []):
-                name = sector.get("name", "Unknown")
-                weight = sector.get("weight", 0) * alloc * 100
-                sector_totals[name] = sector_totals.get(name, 0) + weight
-
-        for sector, total in sector_totals.items():
-            if total > single_sector_limit:
-                violations.append({
-                    "rule": "Sector Concentration",
-                    "detail": f"{sector} is {total:.1f}% (limit: {single_sector_limit}%)",
-                    "severity": "MEDIUM",
-                })
+        violations.extend(
+            {
+                "rule": "Sector Concentration",
+                "detail": f"{sector} is {total:.1f}% (limit: {single_sector_limit}%)",
+                "severity": "MEDIUM",
+            }
+            for sector, total in sector_totals.items()
+            if total > single_sector_limit
+        )
 
         # Check 4: Minimum diversification
         num_holdings = len(holdings)
@@ -121,12 +121,12 @@ async def compliance_check(
                 },
             },
             "message": f"{'COMPLIANT' if compliant else f'{len(violations)} VIOLATION(S)'} — {len(warnings)} warning(s)",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
     except Exception as e:
         return {
             "status": "error",
             "data": None,
             "message": f"Failed compliance check: {str(e)}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
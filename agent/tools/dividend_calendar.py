@@ -1,12 +1,11 @@
 """Tool: Show upcoming ex-dividend dates for portfolio holdings."""
 
 import asyncio
-import time
 
 from langchain_core.tools import tool
 
-from agent.dividend_client import DividendClient
-from agent.ghostfolio_client import GhostfolioClient
+from agent.tools._clients import get_dividend_client, get_gf_client
+from agent.tools._timing import elapsed_s, now_ns
 
 
 @tool
@@ -20,11 +19,11 @@ async def dividend_calendar(
     Args:
         days_ahead: How many days ahead to look for upcoming dividends (default 90).
     """
-    start = time.time()
+    start = now_ns()
 
     try:
         # Fetch portfolio holdings from Ghostfolio
-        gf = GhostfolioClient()
+        gf = get_gf_client()
         holdings_data = await gf.get_portfolio_holdings()
         holdings = holdings_data.get("holdings", [])
 
@@ -39,11 +38,11 @@ async def dividend_calendar(
                 "status": "success",
                 "data": {"upcoming": [], "count": 0, "next_payout_date": ""},
                 "message": "No holdings found in your portfolio.",
-                "execution_time": round(time.time() - start, 3),
+                "execution_time": elapsed_s(start),
             }
 
         # Fetch upcoming dividends via yfinance (synchronous, run in thread)
-        client = DividendClient()
+        client = get_dividend_client()
         upcoming = await asyncio.to_thread(client.get_upcoming_dividends, symbols)
 
         next_date = upcoming[0]["ex_date"] if upcoming else ""
@@ -56,12 +55,12 @@ async def dividend_calendar(
                 "next_payout_date": next_date,
             },
             "message": f"{len(upcoming)} upcoming dividend(s) from your {len(symbols)} holdings",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
     except Exception as e:
         return {
             "status": "error",
             "data": None,
             "message": f"Failed to fetch dividend calendar: {str(e)}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
@@ -1,11 +1,9 @@
 """Tool: CRUD management for dividend income goals."""
 
-import asyncio
-import time
-
 from langchain_core.tools import tool
 
 from agent.database import create_goal, delete_goal, get_goals, update_goal
+from agent.tools._timing import elapsed_s, now_ns
 
 
 @tool
@@ -31,122 +29,122 @@ async def dividend_goal_manager(
         notes: Free-text notes. Used with create/update.
         goal_id: ID of the goal to update or delete.
     """
-    start = time.time()
+    start = now_ns()
 
-    try:
-        if action == "create":
-            if target_monthly <= 0 and target_annual <= 0:
-                return {
-                    "status": "error",
-                    "data": None,
-                    "message": "Please provide a target_monthly or target_annual amount greater than zero.",
-                    "execution_time": round(time.time() - start, 3),
-                }
-            goal = await asyncio.to_thread(
-                create_goal,
-                target_monthly=target_monthly,
-                target_annual=target_annual,
-                currency=currency,
-                deadline=deadline,
-                notes=notes,
-            )
-            return {
-                "status": "success",
-                "data": {"action": "created", "goal": goal},
-                "message": f"Goal created: ${goal['target_monthly']:,.0f}/month (${goal['target_annual']:,.0f}/year) in {goal['currency']}",
-                "execution_time": round(time.time() - start, 3),
-            }
-
-        elif action == "list":
-            goals = await asyncio.to_thread(get_goals)
-            return {
-                "status": "success",
-                "data": {"action": "list", "goals": goals, "count": len(goals)},
-                "message": f"You have {len(goals)} dividend income goal(s)." if goals else "No dividend goals set yet.",
-                "execution_time": round(time.time() - start, 3),
-            }
-
-        elif action == "update":
-            if not goal_id:
-                # If no goal_id, try updating the most recent goal
-                goals = await asyncio.to_thread(get_goals)
-                if not goals:
-                    return {
-                        "status": "error",
-                        "data": None,
-                        "message": "No goals found to update. Create one first.",
-                        "execution_time": round(time.time() - start, 3),
-                    }
-                goal_id = goals[0]["id"]
-
-            kwargs = {}
-            if target_monthly > 0:
-                kwargs["target_monthly"] = target_monthly
-                if target_annual <= 0:
-                    kwargs["target_annual"] = target_monthly * 12
-            if target_annual > 0:
-                kwargs["target_annual"] = target_annual
-                if target_monthly <= 0:
-                    kwargs["target_monthly"] = target_annual / 12
-            if deadline:
-                kwargs["deadline"] = deadline
-            if notes:
-                kwargs["notes"] = notes
-
-            updated = await asyncio.to_thread(update_goal, goal_id, **kwargs)
-            if not updated:
-                return {
-                    "status": "error",
-                    "data": None,
-                    "message": f"Goal with ID {goal_id} not found.",
-                    "execution_time": round(time.time() - start, 3),
-                }
-            return {
-                "status": "success",
-                "data": {"action": "updated", "goal": updated},
-                "message": f"Goal updated: ${updated['target_monthly']:,.0f}/month",
-                "execution_time": round(time.time() - start, 3),
-            }
-
-        elif action == "delete":
-            if not goal_id:
-                goals = await asyncio.to_thread(get_goals)
-                if not goals:
-                    return {
-                        "status": "error",
-                        "data": None,
-                        "message": "No goals found to delete.",
-                        "execution_time": round(time.time() - start, 3),
-                    }
-                goal_id = goals[0]["id"]
-
-            deleted = await asyncio.to_thread(delete_goal, goal_id)
-            if not deleted:
-                return {
-                    "status": "error",
-                    "data": None,
-                    "message": f"Goal with ID {goal_id} not found.",
-                    "execution_time": round(time.time() - start, 3),
-                }
-            return {
-                "status": "success",
-                "data": {"action": "deleted", "goal_id": goal_id},
-                "message": f"Goal {goal_id} deleted successfully.",
-                "execution_time": round(time.time() - start, 3),
-            }
-
-        else:
-            return {
-                "status": "error",
-                "data": None,
-                "message": f"Unknown action '{action}'. Use create, list, update, or delete.",
-                "execution_time": round(time.time() - start, 3),
-            }
+    handler = _ACTIONS.get(action)
+    if handler is None:
+        return _err(f"Unknown action '{action}'. Use create, list, update, or delete.", start)
 
+    try:
+        return await handler(
+            start,
+            target_monthly=target_monthly,
+            target_annual=target_annual,
+            currency=currency,
+            deadline=deadline,
+            notes=notes,
+            goal_id=goal_id,
+        )
     except Exception as e:
-        return {
-            "status": "error",
-            "data": None,
-            "message": f"Goal manager error: {str(e)}",
-            "execution_time": round(time.time() - start, 3),
-        }
+        return _err(f"Goal manager error: {str(e)}", start)
+
+
+def _ok(data: dict, message: str, start: int) -> dict:
+    return {
+        "status": "success",
+        "data": data,
+        "message": message,
+        "execution_time": elapsed_s(start),
+    }
+
+
+def _err(message: str, start: int) -> dict:
+    return {
+        "status": "error",
+        "data": None,
+        "message": message,
+        "execution_time": elapsed_s(start),
+    }
+
+
+async def _create(start: int, *, target_monthly, target_annual, currency, deadline, notes, **_) -> dict:
+    if target_monthly <= 0 and target_annual <= 0:
+        return _err("Please provide a target_monthly or target_annual amount greater than zero.", start)
+    goal = await create_goal(
+        target_monthly=target_monthly,
+        target_annual=target_annual,
+        currency=currency,
+        deadline=deadline,
+        notes=notes,
+    )
+    return _ok(
+        {"action": "created", "goal": goal},
+        f"Goal created: ${goal['target_monthly']:,.0f}/month (${goal['target_annual']:,.0f}/year) in {goal['currency']}",
+        start,
+    )
+
+
+async def _list(start: int, **_) -> dict:
+    goals = await get_goals()
+    return _ok(
+        {"action": "list", "goals": goals, "count": len(goals)},
+        f"You have {len(goals)} dividend income goal(s)." if goals else "No dividend goals set yet.",
+        start,
+    )
+
+
+async def _update(start: int, *, target_monthly, target_annual, deadline, notes, goal_id, **_) -> dict:
+    if not goal_id:
+        # If no goal_id, try updating the most recent goal
+        goals = await get_goals()
+        if not goals:
+            return _err("No goals found to update. Create one first.", start)
+        goal_id = goals[0]["id"]
+
+    kwargs = {}
+    if target_monthly > 0:
+        kwargs["target_monthly"] = target_monthly
+        if target_annual <= 0:
+            kwargs["target_annual"] = target_monthly * 12
+    if target_annual > 0:
+        kwargs["target_annual"] = target_annual
+        if target_monthly <= 0:
+            kwargs["target_monthly"] = target_annual / 12
+    if deadline:
+        kwargs["deadline"] = deadline
+    if notes:
+        kwargs["notes"] = notes
+
+    updated = await update_goal(goal_id, **kwargs)
+    if not updated:
+        return _err(f"Goal with ID {goal_id} not found.", start)
+    return _ok(
+        {"action": "updated", "goal": updated},
+        f"Goal updated: ${updated['target_monthly']:,.0f}/month",
+        start,
+    )
+
+
+async def _delete(start: int, *, goal_id, **_) -> dict:
+    if not goal_id:
+        goals = await get_goals()
+        if not goals:
+            return _err("No goals found to delete.", start)
+        goal_id = goals[0]["id"]
+
+    deleted = await delete_goal(goal_id)
+    if not deleted:
+        return _err(f"Goal with ID {goal_id} not found.", start)
+    return _ok(
+        {"action": "deleted", "goal_id": goal_id},
+        f"Goal {goal_id} deleted successfully.",
+        start,
+    )
+
+
+_ACTIONS = {
+    "create": _create,
+    "list": _list,
+    "update": _update,
+    "delete": _delete,
+}
@@ -1,13 +1,12 @@
 """Tool: Project annual and monthly dividend income from current portfolio."""
 
 import asyncio
-import time
 
 from langchain_core.tools import tool
 
 from agent.database import get_goals
-from agent.dividend_client import DividendClient
-from agent.ghostfolio_client import GhostfolioClient
+from agent.tools._clients import get_dividend_client, get_gf_client
+from agent.tools._timing import elapsed_s, now_ns
 
 
 @tool
@@ -21,19 +20,20 @@ async def dividend_income_projection(
     Args:
         include_growth: Whether to include 5-year dividend growth projections (slower).
     """
-    start = time.time()
+    start = now_ns()
 
     try:
-        # Fetch portfolio holdings
-        gf = GhostfolioClient()
-        holdings_data = await gf.get_portfolio_holdings()
-        raw_holdings = holdings_data.get("holdings", [])
+        # Fetch portfolio holdings and saved goals concurrently
+        gf = get_gf_client()
+        holdings_data, goals = await asyncio.gather(gf.get_portfolio_holdings(), get_goals())
 
-        holdings = [
-            {"symbol": h.get("symbol", ""), "value": h.get("valueInBaseCurrency", 0)}
-            for h in raw_holdings
-            if h.get("symbol") and h.get("valueInBaseCurrency", 0) > 0
-        ]
+        # Keep holdings with a symbol and positive value, reading each field once
+        holdings = []
+        for h in holdings_data.get("holdings", []):
+            symbol = h.get("symbol")
+            value = h.get("valueInBaseCurrency", 0)
+            if symbol and value > 0:
+                holdings.append({"symbol": symbol, "value": value})
 
         if not holdings:
             return {
@@ -46,17 +46,16 @@ async def dividend_income_projection(
                     "goal_progress": None,
                 },
                 "message": "No holdings with value found in your portfolio.",
-                "execution_time": round(time.time() - start, 3),
+                "execution_time": elapsed_s(start),
             }
 
         # Project income (synchronous yfinance calls, run in thread)
-        client = DividendClient()
+        client = get_dividend_client()
         projection = await asyncio.to_thread(
             client.get_projected_annual_income, holdings
         )
 
         # Check against saved goals
-        goals = await asyncio.to_thread(get_goals)
         goal_progress = None
         if goals:
             primary = goals[0]  # most recent goal
@@ -80,12 +79,12 @@ async def dividend_income_projection(
                 "goal_progress": goal_progress,
             },
             "message": f"Projected annual dividend income: ${projection['total_annual']:,.2f} (${projection['total_monthly']:,.2f}/month)",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
     except Exception as e:
         return {
             "status": "error",
             "data": None,
             "message": f"Failed to project dividend income: {str(e)}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
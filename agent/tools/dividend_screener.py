@@ -1,11 +1,14 @@
 """Tool: Look up dividend information for any stock."""
 
 import asyncio
-import time
+from statistics import fmean
 
 from langchain_core.tools import tool
 
-from agent.dividend_client import DividendClient
+from agent.tools._clients import get_dividend_client
+from agent.tools._timing import elapsed_s, now_ns
+
+MAX_CONCURRENT_LOOKUPS = 8
 
 
 @tool
@@ -21,8 +24,8 @@ async def dividend_screener(
         symbol: A single ticker symbol (e.g. "JNJ").
         symbols: Comma-separated ticker symbols for multi-lookup (e.g. "JNJ,PG,KO").
     """
-    start = time.time()
-    client = DividendClient()
+    start = now_ns()
+    client = get_dividend_client()
 
     tickers: list[str] = []
     if symbols:
@@ -35,15 +38,26 @@ async def dividend_screener(
             "status": "error",
             "data": None,
             "message": "Please provide at least one stock symbol.",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
 
     try:
-        stocks: list[dict] = []
-        for sym in tickers:
-            info = await asyncio.to_thread(client.get_dividend_info, sym)
-            history = await asyncio.to_thread(client.get_dividend_history, sym, 5)
+        # Fetch every symbol's info and history concurrently (yfinance is
+        # blocking, so each call runs in a thread); the semaphore keeps large
+        # lists from exhausting the default thread pool.
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
+
+        async def fetch(sym: str) -> tuple[dict, list[dict]]:
+            async with semaphore:
+                return await asyncio.gather(
+                    asyncio.to_thread(client.get_dividend_info, sym),
+                    asyncio.to_thread(client.get_dividend_history, sym, 5),
+                )
 
+        results = await asyncio.gather(*(fetch(sym) for sym in tickers))
+
+        stocks: list[dict] = []
+        for info, history in results:
             # Calculate 5-year dividend growth rate from history
             growth_rate = _calc_growth_rate(history)
 
@@ -58,14 +72,14 @@ async def dividend_screener(
             "status": "success",
             "data": {"stocks": stocks},
             "message": f"Dividend data for {len(stocks)} stock(s)",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
     except Exception as e:
         return {
             "status": "error",
             "data": None,
             "message": f"Failed to fetch dividend data: {str(e)}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
 
 
@@ -74,8 +88,8 @@ def _calc_growth_rate(history: list[dict]) -> float:
     if len(history) < 8:
         return 0.0
     # Compare average of first 4 vs last 4 payments
-    early = sum(d["amount"] for d in history[:4]) / 4
-    recent = sum(d["amount"] for d in history[-4:]) / 4
+    early = fmean(d["amount"] for d in history[:4])
+    recent = fmean(d["amount"] for d in history[-4:])
     if early <= 0:
         return 0.0
     years = max(1, len(history) / 4)  # approximate years
@@ -1,10 +1,15 @@
 """Tool: Fetch current market data for symbols."""
 
-import time
-
 from langchain_core.tools import tool
 
-from agent.ghostfolio_client import GhostfolioClient
+from agent.tools._clients import get_gf_client
+from agent.tools._timing import elapsed_s, now_ns
+
+
+VALID_SOURCES = frozenset({
+    "YAHOO", "COINGECKO", "ALPHA_VANTAGE",
+    "FINANCIAL_MODELING_PREP", "MANUAL",
+})
 
 
 @tool
@@ -21,14 +26,10 @@ async def market_data_lookup(
         data_source: The data source to use. Options: 'YAHOO', 'COINGECKO',
                      'ALPHA_VANTAGE', 'FINANCIAL_MODELING_PREP'. Defaults to 'YAHOO'.
     """
-    start = time.time()
-    client = GhostfolioClient()
-
-    valid_sources = {
-        "YAHOO", "COINGECKO", "ALPHA_VANTAGE",
-        "FINANCIAL_MODELING_PREP", "MANUAL",
-    }
-    if data_source not in valid_sources:
+    start = now_ns()
+    client = get_gf_client()
+
+    if data_source not in VALID_SOURCES:
         data_source = "YAHOO"
 
     try:
@@ -48,12 +49,12 @@ async def market_data_lookup(
                 "countries": data.get("countries", []),
             },
             "message": f"{symbol.upper()}: {data.get('marketPrice', 'N/A')} {data.get('currency', '')}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
     except Exception as e:
         return {
             "status": "error",
             "data": None,
             "message": f"Failed to look up {symbol}: {str(e)}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
@@ -1,10 +1,12 @@
 """Tool: Analyze portfolio holdings, allocation, and sector breakdown."""
 
-import time
+import heapq
+from collections import defaultdict
 
 from langchain_core.tools import tool
 
-from agent.ghostfolio_client import GhostfolioClient
+from agent.tools._clients import get_gf_client
+from agent.tools._timing import elapsed_s, now_ns
 
 
 @tool
@@ -22,8 +24,8 @@ async def portfolio_analysis(
         asset_class_filter: Optional asset class to filter (EQUITY, FIXED_INCOME, etc.).
         tag_filter: Optional tag name to filter holdings by.
     """
-    start = time.time()
-    client = GhostfolioClient()
+    start = now_ns()
+    client = get_gf_client()
 
     try:
         params = {}
@@ -37,9 +39,9 @@ async def portfolio_analysis(
         details = await client.get_portfolio_details(filters=params or None)
         holdings = details.get("holdings", {})
 
-        # Compute sector allocation
-        sector_allocation = {}
-        asset_class_allocation = {}
+        # Single pass: per-holding summary plus sector/asset-class totals
+        sector_allocation = defaultdict(float)
+        asset_class_allocation = defaultdict(float)
         total_value = 0
 
         holdings_summary = []
@@ -58,20 +60,17 @@ async def portfolio_analysis(
                 "value": round(value, 2),
             })
 
-            ac = holding.get("assetClass", "Unknown")
-            asset_class_allocation[ac] = asset_class_allocation.get(ac, 0) + alloc
+            asset_class_allocation[holding.get("assetClass", "Unknown")] += alloc
+            for sector_info in holding.get("sectors", ()):
+                sector_allocation[sector_info.get("name", "Unknown")] += sector_info.get("weight", 0) * alloc
 
-            for sector_info in holding.get("sectors", []):
-                name = sector_info.get("name", "Unknown")
-                weight = sector_info.get("weight", 0) * alloc
-                sector_allocation[name] = sector_allocation.get(name, 0) + weight
-
-        # Sort holdings by allocation descending
-        holdings_summary.sort(key=lambda h: h["allocation_pct"], reverse=True)
+        # Top 20 holdings by allocation. Allocations sum to at most 100%, so
+        # every holding above the 20% warning threshold is among them.
+        top_holdings = heapq.nlargest(20, holdings_summary, key=lambda h: h["allocation_pct"])
 
         # Build warnings
         warnings = []
-        for h in holdings_summary:
+        for h in top_holdings:
             if h["allocation_pct"] > 20:
                 warnings.append(
                     f"High concentration: {h['name']} at {h['allocation_pct']}%"
@@ -87,25 +86,23 @@ async def portfolio_analysis(
             "data": {
                 "total_value": round(total_value, 2),
                 "holdings_count": len(holdings_summary),
-                "holdings": holdings_summary[:20],  # Top 20
+                "holdings": top_holdings,
                 "asset_class_allocation": {
                     k: round(v * 100, 2) for k, v in asset_class_allocation.items()
                 },
                 "sector_allocation": {
                     k: round(v * 100, 2)
-                    for k, v in sorted(
-                        sector_allocation.items(), key=lambda x: x[1], reverse=True
-                    )[:10]
+                    for k, v in heapq.nlargest(10, sector_allocation.items(), key=lambda kv: kv[1])
                 },
                 "warnings": warnings,
             },
             "message": f"Portfolio has {len(holdings_summary)} holdings worth {round(total_value, 2)}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
     except Exception as e:
         return {
             "status": "error",
             "data": None,
             "message": f"Failed to analyze portfolio: {str(e)}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
@@ -1,10 +1,12 @@
 """Tool: Get portfolio performance metrics over a date range."""
 
-import time
-
 from langchain_core.tools import tool
 
-from agent.ghostfolio_client import GhostfolioClient
+from agent.tools._clients import get_gf_client
+from agent.tools._timing import elapsed_s, now_ns
+
+
+VALID_RANGES = frozenset({"1d", "1w", "1m", "3m", "6m", "ytd", "1y", "3y", "5y", "max"})
 
 
 @tool
@@ -19,11 +21,10 @@ async def portfolio_performance(
         date_range: Time period to analyze. Options: '1d', '1w', '1m', '3m', '6m',
                     'ytd', '1y', '3y', '5y', 'max'. Defaults to 'ytd'.
     """
-    start = time.time()
-    client = GhostfolioClient()
+    start = now_ns()
+    client = get_gf_client()
 
-    valid_ranges = {"1d", "1w", "1m", "3m", "6m", "ytd", "1y", "3y", "5y", "max"}
-    if date_range not in valid_ranges:
+    if date_range not in VALID_RANGES:
         date_range = "ytd"
 
     try:
@@ -55,12 +56,12 @@ async def portfolio_performance(
                 "data_points": len(chart),
             },
             "message": f"Performance over {date_range}: {performance_data.get('netPerformancePercentage', 0):.2%}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
     except Exception as e:
         return {
             "status": "error",
             "data": None,
             "message": f"Failed to get performance: {str(e)}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
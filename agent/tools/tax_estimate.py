@@ -1,10 +1,11 @@
 """Tool: Estimate capital gains/losses and dividend income for tax purposes."""
 
-import time
+import asyncio
 
 from langchain_core.tools import tool
 
-from agent.ghostfolio_client import GhostfolioClient
+from agent.tools._clients import get_gf_client
+from agent.tools._timing import elapsed_s, now_ns
 
 
 DISCLAIMER = (
@@ -29,18 +30,16 @@ async def tax_estimate(
         date_range: Period for the estimate: 'ytd', '1y', '3y', '5y', 'max'.
                     Defaults to 'ytd'.
     """
-    start = time.time()
-    client = GhostfolioClient()
+    start = now_ns()
+    client = get_gf_client()
 
     try:
-        # Get performance data (contains gains/losses and dividends)
-        perf = await client.get_portfolio_performance(date_range=date_range)
-        performance = perf.get("performance", {})
-
-        # Get dividend data
-        dividends_data = await client.get_portfolio_dividends(
-            date_range=date_range, group_by="month"
+        # Performance (gains/losses) and dividends are independent requests
+        perf, dividends_data = await asyncio.gather(
+            client.get_portfolio_performance(date_range=date_range),
+            client.get_portfolio_dividends(date_range=date_range, group_by="month"),
         )
+        performance = perf.get("performance", {})
         dividends_list = dividends_data.get("dividends", [])
         total_dividends = sum(d.get("investment", 0) for d in dividends_list)
 
@@ -71,12 +70,12 @@ async def tax_estimate(
                 "disclaimer": DISCLAIMER,
             },
             "message": f"{gains_type}: {round(estimated_gains, 2)}, Dividends: {round(total_dividends, 2)}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
     except Exception as e:
         return {
             "status": "error",
             "data": {"disclaimer": DISCLAIMER},
             "message": f"Failed to estimate taxes: {str(e)}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
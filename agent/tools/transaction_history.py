@@ -1,11 +1,30 @@
 """Tool: Retrieve and categorize transaction/activity history."""
 
-import time
+import heapq
 from collections import Counter
 
 from langchain_core.tools import tool
 
-from agent.ghostfolio_client import GhostfolioClient
+from agent.tools._clients import get_gf_client
+from agent.tools._timing import elapsed_s, now_ns
+
+
+VALID_TYPES = frozenset({"BUY", "SELL", "DIVIDEND", "FEE", "INTEREST", "LIABILITY"})
+
+
+def _summarize_activity(activity: dict) -> dict:
+    """Reduce a Ghostfolio activity to the fields reported by the tool."""
+    get = activity.get
+    profile = get("SymbolProfile")
+    return {
+        "date": get("date", ""),
+        "type": get("type", ""),
+        "symbol": profile.get("symbol", "") if isinstance(profile, dict) else "",
+        "quantity": get("quantity", 0),
+        "unit_price": get("unitPrice", 0),
+        "fee": get("fee", 0),
+        "currency": get("currency", ""),
+    }
 
 
 @tool
@@ -22,8 +41,8 @@ async def transaction_history(
         type_filter: Optional activity type filter: 'BUY', 'SELL', 'DIVIDEND',
                      'FEE', 'INTEREST', 'LIABILITY'.
     """
-    start = time.time()
-    client = GhostfolioClient()
+    start = now_ns()
+    client = get_gf_client()
 
     try:
         params = {}
@@ -37,31 +56,22 @@ async def transaction_history(
             activities = []
 
         # Apply type filter locally if provided
-        valid_types = {"BUY", "SELL", "DIVIDEND", "FEE", "INTEREST", "LIABILITY"}
-        if type_filter and type_filter.upper() in valid_types:
+        type_filter = type_filter.upper()
+        if type_filter in VALID_TYPES:
             activities = [
-                a for a in activities if a.get("type") == type_filter.upper()
+                a for a in activities if a.get("type") == type_filter
             ]
 
-        # Categorize
-        type_counts = Counter(a.get("type", "UNKNOWN") for a in activities)
-        total_fees = sum(a.get("fee", 0) for a in activities)
+        # Categorize and total fees in one pass
+        type_counts = Counter()
+        total_fees = 0
+        for a in activities:
+            type_counts[a.get("type", "UNKNOWN")] += 1
+            total_fees += a.get("fee", 0)
 
         # Recent activities (last 20)
-        recent = sorted(activities, key=lambda a: a.get("date", ""), reverse=True)[:20]
-        recent_summary = []
-        for a in recent:
-            recent_summary.append({
-                "date": a.get("date", ""),
-                "type": a.get("type", ""),
-                "symbol": a.get("SymbolProfile", {}).get("symbol", "")
-                if isinstance(a.get("SymbolProfile"), dict)
-                else "",
-                "quantity": a.get("quantity", 0),
-                "unit_price": a.get("unitPrice", 0),
-                "fee": a.get("fee", 0),
-                "currency": a.get("currency", ""),
-            })
+        recent = heapq.nlargest(20, activities, key=lambda a: a.get("date", ""))
+        recent_summary = [_summarize_activity(a) for a in recent]
 
         return {
             "status": "success",
@@ -72,12 +82,12 @@ async def transaction_history(
                 "recent_activities": recent_summary,
             },
             "message": f"Found {len(activities)} activities",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
     except Exception as e:
         return {
             "status": "error",
             "data": None,
             "message": f"Failed to get transactions: {str(e)}",
-            "execution_time": round(time.time() - start, 3),
+            "execution_time": elapsed_s(start),
         }
@@ -1,5 +1,5 @@
 """Verification layer for high-stakes financial domain."""
 
-from agent.verification.verifier import ResponseVerifier
+from agent.verification.verifier import ResponseVerifier, has_checkable_claims
 
-__all__ = ["ResponseVerifier"]
+__all__ = ["ResponseVerifier", "has_checkable_claims"]
@@ -1,25 +1,100 @@
 """Response verification: fact-checking, hallucination detection, confidence scoring, domain constraints."""
 
 import re
+from dataclasses import dataclass
+
+try:
+    import ahocorasick  # optional: single-pass multi-keyword matching
+except ImportError:
+    ahocorasick = None
 
 from agent.models import VerificationResult
 
 
-FINANCIAL_DISCLAIMER_KEYWORDS = [
+FINANCIAL_DISCLAIMER_KEYWORDS = (
     "not financial advice",
     "consult",
     "professional",
     "informational purposes",
     "disclaimer",
-]
+)
 
-TAX_DISCLAIMER_KEYWORDS = [
+TAX_DISCLAIMER_KEYWORDS = (
     "tax professional",
     "consult",
     "jurisdiction",
     "disclaimer",
     "estimate",
-]
+)
+
+
+def _keyword_matcher(keywords: tuple[str, ...]):
+    """Return a predicate telling whether any of *keywords* occurs in a string.
+
+    Uses an Aho-Corasick automaton (one scan for all keywords) when
+    ``pyahocorasick`` is installed, otherwise a substring test per keyword.
+    """
+    if ahocorasick is None:
+        return lambda text: any(kw in text for kw in keywords)
+
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return lambda text: next(automaton.iter(text), None) is not None
+
+
+_has_tax_disclaimer = _keyword_matcher(TAX_DISCLAIMER_KEYWORDS)
+_has_financial_disclaimer = _keyword_matcher(FINANCIAL_DISCLAIMER_KEYWORDS)
+
+# Compiled once at import; verify() runs on every agent response. A match
+# that starts with "$" is a dollar amount, so one scan serves both checks.
+_NUMBER_RE = re.compile(r'[\$]?([\d,]+\.?\d*)\s*%?')
+
+# Directive or overconfident phrasing the agent should never produce
+_BUY_SELL_RES = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'\b(you should|I recommend|must) (buy|sell|short)\b',
+        r'\bguaranteed\b',
+        r'\brisk[- ]?free\b',
+        r'\bwill (definitely|certainly|surely) (go up|increase|rise)\b',
+    )
+)
+
+
+def has_checkable_claims(text: str) -> bool:
+    """Whether *text* has anything the checks act on without tool data.
+
+    Numbers and dollar amounts feed the fact and hallucination checks;
+    directive or overconfident phrasing fails the domain constraints.
+    """
+    return (
+        "$" in text
+        or any(ch.isdigit() for ch in text)
+        or any(rx.search(text) for rx in _BUY_SELL_RES)
+    )
+
+
+@dataclass
+class ResponseScan:
+    """What the checks need from the response text, gathered in one pass."""
+
+    lower: str
+    numbers: set[float]
+    has_dollar_amount: bool
+    directive_patterns: list[str]
+    too_short: bool
+
+
+@dataclass
+class ToolScan:
+    """What the checks need from the tool results, gathered in one pass."""
+
+    total: int
+    successes: int
+    errors: int
+    with_data: list[dict]
 
 
 class ResponseVerifier:
@@ -47,9 +122,13 @@ class ResponseVerifier:
         checks_passed = 0
         checks_total = 0
 
+        # Scan the response and the tool results once; checks read the scans
+        response = self._scan_response(response_text)
+        tools = self._scan_tool_results(tool_results)
+
         # Check 1: Fact-checking (numbers in response match tool data)
         checks_total += 1
-        fact_result = self._check_facts(response_text, tool_results)
+        fact_result = self._check_facts(response, tools)
         if fact_result["passed"]:
             checks_passed += 1
         else:
@@ -59,7 +138,7 @@ class ResponseVerifier:
 
         # Check 2: Hallucination detection
         checks_total += 1
-        hallucination_result = self._check_hallucination(response_text, tool_results)
+        hallucination_result = self._check_hallucination(response, tools)
         if hallucination_result["passed"]:
             checks_passed += 1
         else:
@@ -67,7 +146,7 @@ class ResponseVerifier:
 
         # Check 3: Domain constraint checks
         checks_total += 1
-        constraint_result = self._check_domain_constraints(response_text, query_type)
+        constraint_result = self._check_domain_constraints(response.lower, query_type)
         if constraint_result["passed"]:
             checks_passed += 1
         else:
@@ -76,7 +155,7 @@ class ResponseVerifier:
 
         # Check 4: Output completeness
         checks_total += 1
-        completeness_result = self._check_completeness(response_text, tool_results)
+        completeness_result = self._check_completeness(response, tools)
         if completeness_result["passed"]:
             checks_passed += 1
         else:
@@ -86,7 +165,7 @@ class ResponseVerifier:
         confidence = checks_passed / checks_total if checks_total > 0 else 0.0
 
         # Boost confidence if all tools succeeded
-        tool_success_rate = self._tool_success_rate(tool_results)
+        tool_success_rate = self._tool_success_rate(tools)
         confidence = (confidence * 0.7) + (tool_success_rate * 0.3)
 
         return VerificationResult(
@@ -97,32 +176,64 @@ class ResponseVerifier:
             sources=sources,
         )
 
-    def _check_facts(self, response: str, tool_results: list[dict]) -> dict:
-        """Verify numbers in the response appear in tool result data."""
-        # Extract numbers from response (dollar amounts, percentages)
-        response_numbers = set()
-        for match in re.finditer(r'[\$]?([\d,]+\.?\d*)\s*%?', response):
+    def _scan_response(self, response: str) -> ResponseScan:
+        """Extract everything the checks inspect in the response text."""
+        # Numbers (dollar amounts, percentages) in a single regex pass
+        numbers = set()
+        has_dollar_amount = False
+        for match in _NUMBER_RE.finditer(response):
+            if match.group(0)[0] == "$":
+                has_dollar_amount = True
             try:
-                num_str = match.group(1).replace(",", "")
-                num = float(num_str)
-                if num > 0.01:  # Ignore trivially small numbers
-                    response_numbers.add(round(num, 2))
+                num = float(match.group(1).replace(",", ""))
             except ValueError:
                 continue
+            if num > 0.01:  # Ignore trivially small numbers
+                numbers.add(round(num, 2))
+
+        return ResponseScan(
+            lower=response.lower(),
+            numbers=numbers,
+            has_dollar_amount=has_dollar_amount,
+            directive_patterns=[rx.pattern for rx in _BUY_SELL_RES if rx.search(response)],
+            too_short=not response or len(response.strip()) < 20,
+        )
 
+    def _scan_tool_results(self, tool_results: list[dict]) -> ToolScan:
+        """Tally tool outcomes and collect successful results carrying data."""
+        successes = 0
+        errors = 0
+        with_data = []
+        for result in tool_results:
+            status = result.get("status")
+            if status == "success":
+                successes += 1
+                if result.get("data"):
+                    with_data.append(result)
+            elif status == "error":
+                errors += 1
+        return ToolScan(total=len(tool_results), successes=successes, errors=errors, with_data=with_data)
+
+    def _check_facts(self, response: ResponseScan, tools: ToolScan) -> dict:
+        """Verify numbers in the response appear in tool result data."""
+        response_numbers = response.numbers
         if not response_numbers:
             return {"passed": True, "sources": ["No numerical claims to verify"]}
 
-        # Extract numbers from tool results
+        successful = tools.with_data
+        sources = [f"Tool data: {r.get('message', 'unknown')}" for r in successful]
+
+        # Extract numbers from tool results, stopping once every response
+        # number has been traced
         tool_numbers = set()
-        sources = []
-        for result in tool_results:
-            if result.get("status") == "success" and result.get("data"):
-                self._extract_numbers(result["data"], tool_numbers)
-                sources.append(f"Tool data: {result.get('message', 'unknown')}")
+        unverified = response_numbers
+        for result in successful:
+            self._extract_numbers(result["data"], tool_numbers)
+            unverified = unverified - tool_numbers
+            if not unverified:
+                break
 
         # Check how many response numbers are in tool data
-        unverified = response_numbers - tool_numbers
         verified_ratio = 1 - (len(unverified) / len(response_numbers)) if response_numbers else 1
 
         warnings = []
@@ -138,91 +249,84 @@ class ResponseVerifier:
             "sources": sources,
         }
 
-    def _extract_numbers(self, data, numbers_set: set, depth: int = 0):
-        """Recursively extract numbers from nested data structures."""
-        if depth > 5:
-            return
-        if isinstance(data, (int, float)):
-            numbers_set.add(round(float(data), 2))
-            numbers_set.add(round(abs(float(data)), 2))
-        elif isinstance(data, dict):
-            for v in data.values():
-                self._extract_numbers(v, numbers_set, depth + 1)
-        elif isinstance(data, list):
-            for item in data:
-                self._extract_numbers(item, numbers_set, depth + 1)
-
-    def _check_hallucination(self, response: str, tool_results: list[dict]) -> dict:
-        """Flag potential hallucinated content."""
-        warnings = []
+    def _extract_numbers(self, data, numbers_set: set, max_depth: int = 5):
+        """Extract numbers from nested data structures, down to ``max_depth``.
 
-        # Check for specific stock recommendations (agent should not make these)
-        buy_sell_patterns = [
-            r'\b(you should|I recommend|must) (buy|sell|short)\b',
-            r'\bguaranteed\b',
-            r'\brisk[- ]?free\b',
-            r'\bwill (definitely|certainly|surely) (go up|increase|rise)\b',
+        Walks the data with an explicit stack rather than recursion. Exact
+        ``type()`` checks match JSON-shaped tool output (bools count as
+        numbers, as ``isinstance`` did).
+        """
+        stack = [(data, 0)]
+        while stack:
+            node, depth = stack.pop()
+            node_type = type(node)
+            if node_type is float or node_type is int or node_type is bool:
+                # Store the magnitude too, since responses quote losses
+                # unsigned; only negatives need the second entry.
+                rounded = round(float(node), 2)
+                numbers_set.add(rounded)
+                if rounded < 0:
+                    numbers_set.add(-rounded)
+            elif depth < max_depth:
+                if node_type is dict:
+                    stack.extend((v, depth + 1) for v in node.values())
+                elif node_type is list:
+                    stack.extend((item, depth + 1) for item in node)
+
+    def _check_hallucination(self, response: ResponseScan, tools: ToolScan) -> dict:
+        """Flag potential hallucinated content."""
+        # Specific stock recommendations (agent should not make these)
+        warnings = [
+            f"Potential hallucination: response contains directive financial advice matching '{pattern}'"
+            for pattern in response.directive_patterns
         ]
-        for pattern in buy_sell_patterns:
-            if re.search(pattern, response, re.IGNORECASE):
-                warnings.append(
-                    f"Potential hallucination: response contains directive financial advice matching '{pattern}'"
-                )
 
         # If no tools were called but response has specific numbers, that's suspicious
-        if not tool_results and re.search(r'\$[\d,]+\.?\d*', response):
+        if not tools.total and response.has_dollar_amount:
             warnings.append(
                 "Response contains dollar amounts but no tools were called to source data"
             )
 
         return {"passed": len(warnings) == 0, "warnings": warnings}
 
-    def _check_domain_constraints(self, response: str, query_type: str) -> dict:
-        """Enforce domain-specific rules."""
+    def _check_domain_constraints(self, response_lower: str, query_type: str) -> dict:
+        """Enforce domain-specific rules on the lowercased response."""
         warnings = []
         errors = []
 
         # Tax queries must have disclaimer
         if query_type == "tax":
-            has_disclaimer = any(
-                kw in response.lower() for kw in TAX_DISCLAIMER_KEYWORDS
-            )
-            if not has_disclaimer:
+            if not _has_tax_disclaimer(response_lower):
                 errors.append(
                     "Tax-related response missing required disclaimer"
                 )
 
         # Advice queries should have general disclaimer
         if query_type == "advice":
-            has_disclaimer = any(
-                kw in response.lower() for kw in FINANCIAL_DISCLAIMER_KEYWORDS
-            )
-            if not has_disclaimer:
+            if not _has_financial_disclaimer(response_lower):
                 warnings.append(
                     "Financial advice response should include disclaimer"
                 )
 
         return {"passed": len(errors) == 0, "warnings": warnings, "errors": errors}
 
-    def _check_completeness(self, response: str, tool_results: list[dict]) -> dict:
+    def _check_completeness(self, response: ResponseScan, tools: ToolScan) -> dict:
         """Check if the response actually addresses the tool results."""
         warnings = []
 
-        if not response or len(response.strip()) < 20:
+        if response.too_short:
             warnings.append("Response is too short — may be incomplete")
 
         # If tools returned errors, response should acknowledge
-        errored_tools = [r for r in tool_results if r.get("status") == "error"]
-        if errored_tools and "unable" not in response.lower() and "error" not in response.lower():
+        if tools.errors and "unable" not in response.lower and "error" not in response.lower:
             warnings.append(
                 "Tools returned errors but response doesn't acknowledge data limitations"
             )
 
         return {"passed": len(warnings) == 0, "warnings": warnings}
 
-    def _tool_success_rate(self, tool_results: list[dict]) -> float:
+    def _tool_success_rate(self, tools: ToolScan) -> float:
         """Calculate the fraction of tools that succeeded."""
-        if not tool_results:
+        if not tools.total:
             return 0.5  # No tools called is neutral
-        successes = sum(1 for r in tool_results if r.get("status") == "success")
-        return successes / len(tool_results)
+        return tools.successes / tools.total
@@ -1,9 +1,35 @@
 """Evaluation framework for systematic agent testing."""
 
-import json
+import asyncio
+import math
+import re
+import sys
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterable, Iterator, Sized
+
+import orjson
+
+try:
+    import ijson  # optional: streams large datasets instead of loading them whole
+except ImportError:
+    ijson = None
+
+# Any of these phrases in a response counts as the agent declining a request.
+# One alternation scans the response once instead of once per phrase.
+_REFUSAL_RE = re.compile(
+    "|".join(
+        re.escape(phrase)
+        for phrase in (
+            "cannot", "can't", "can\u2019t",
+            "won't", "won\u2019t",
+            "don't", "don\u2019t",
+            "unable", "not able", "outside",
+        )
+    ),
+    re.IGNORECASE,
+)
 
 
 @dataclass
@@ -16,6 +42,11 @@ class TestCase:
     expected_tools: list[str]
     expected_outcome: str
     pass_criteria: dict = field(default_factory=dict)
+    # Lowercased words of expected_outcome, split once at construction
+    outcome_keywords: list[str] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.outcome_keywords = self.expected_outcome.lower().split()
 
 
 @dataclass
@@ -34,152 +65,345 @@ class EvalResult:
     details: dict = field(default_factory=dict)
 
 
+def _result_record(r: EvalResult) -> dict:
+    """Serializable summary of one result, as saved to disk."""
+    return {
+        "test_id": r.test_id,
+        "category": r.category,
+        "passed": r.passed,
+        "tools_correct": r.tools_correct,
+        "outcome_match": r.outcome_match,
+        "confidence": r.confidence,
+        "duration": r.duration,
+        "cost": r.cost,
+        "response_preview": r.response[:200],
+    }
+
+
+async def _write_lines(queue: asyncio.Queue, batch_size: int = 100) -> None:
+    """Write queued lines to stdout in batches until a ``None`` sentinel arrives.
+
+    Whatever has accumulated (up to ``batch_size`` lines) goes out in one
+    write and flush, so concurrent workers never contend for stdout.
+    """
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+        done = batch[-1] is None
+        sys.stdout.write("".join(line for line in batch if line is not None))
+        sys.stdout.flush()
+        if done:
+            return
+
+
+def _expected_cost(tc: TestCase) -> tuple[int, int]:
+    """Rough cost of a test case: expected tool calls, then prompt length."""
+    return len(tc.expected_tools), len(tc.input_query)
+
+
+def shard_cases(cases: list[TestCase], shard: int, shards: int) -> list[TestCase]:
+    """Return the *shard*-th of *shards* slices of *cases*, balanced by cost.
+
+    Cases are dealt round-robin in descending expected cost, so every slice
+    gets a similar mix of slow and fast cases.
+    """
+    return sorted(cases, key=_expected_cost, reverse=True)[shard::shards]
+
+
+class _EarlyAbort(Exception):
+    """Raised by an eval worker once the run can no longer pass."""
+
+
+def iter_dataset(path: str) -> Iterator[TestCase]:
+    """Yield test cases from a JSON dataset file as they are parsed.
+
+    With ``ijson`` installed the ``test_cases`` array is parsed one item at a
+    time, so peak memory does not grow with the dataset size.
+    """
+    with open(path, "rb") as f:
+        if ijson is not None:
+            raw_cases = ijson.items(f, "test_cases.item", use_float=True)
+        else:
+            raw_cases = orjson.loads(f.read()).get("test_cases", [])
+        for tc in raw_cases:
+            yield TestCase(
+                id=tc["id"],
+                category=tc["category"],
+                input_query=tc["input_query"],
+                expected_tools=tc.get("expected_tools", []),
+                expected_outcome=tc.get("expected_outcome", ""),
+                pass_criteria=tc.get("pass_criteria", {}),
+            )
+
+
 class EvalFramework:
     """Systematic evaluation for AgentForge."""
 
     def __init__(self):
         self.test_cases: list[TestCase] = []
         self.results: list[EvalResult] = []
+        # Set when the last run stopped early because min_pass_rate was
+        # already out of reach
+        self.early_aborted = False
+        # Summary of the current results; built (and printed) once per run
+        self._report: dict | None = None
 
     def load_dataset(self, path: str) -> None:
         """Load test cases from a JSON file."""
-        with open(path) as f:
-            data = json.load(f)
-
-        for tc in data.get("test_cases", []):
-            self.test_cases.append(TestCase(
-                id=tc["id"],
-                category=tc["category"],
-                input_query=tc["input_query"],
-                expected_tools=tc.get("expected_tools", []),
-                expected_outcome=tc.get("expected_outcome", ""),
-                pass_criteria=tc.get("pass_criteria", {}),
-            ))
+        self.test_cases.extend(iter_dataset(path))
 
     def add_test_case(self, test_case: TestCase) -> None:
         """Add a single test case."""
         self.test_cases.append(test_case)
 
-    async def run_evaluation(self, agent_fn, verbose: bool = False) -> dict:
+    async def run_evaluation(
+        self,
+        agent_fn,
+        verbose: bool = False,
+        max_concurrency: int = 5,
+        test_cases: Iterable[TestCase] | None = None,
+        min_pass_rate: float | None = None,
+        results_log: str | None = None,
+    ) -> dict:
         """Run all test cases against the agent.
 
+        ``max_concurrency`` workers pull cases from a shared iterator, so a
+        lazily parsed dataset (see ``iter_dataset``) starts running as soon as
+        its first rows are read. A sized collection is instead dispatched
+        longest-expected-first, so slow cases do not straggle at the end of
+        the run. Results keep dataset order; per-test status lines are
+        printed as cases finish, through a single batched writer.
+
+        With ``min_pass_rate`` set the run fails fast: as soon as more cases
+        have failed than that rate allows, in-flight cases are cancelled, the
+        rest are skipped and ``early_aborted`` is set.
+
         Args:
             agent_fn: Async callable(message: str) -> dict with keys:
                       response, tools_used, confidence, metrics.
             verbose: Print per-test results.
+            max_concurrency: Maximum number of test cases in flight.
+            test_cases: Cases to run instead of ``self.test_cases``; they are
+                        recorded in ``self.test_cases`` (as they are
+                        consumed, if not sized).
+            min_pass_rate: Abort once this pass rate can no longer be reached.
+                           Requires the number of cases to be known up front.
+            results_log: Optional JSONL path; each result is appended and
+                         flushed as soon as its case finishes, so a crashed
+                         run keeps everything completed so far.
         """
+        cases_source = self.test_cases if test_cases is None else test_cases
+        max_failures = None
+        if min_pass_rate is not None:
+            if not isinstance(cases_source, Sized):
+                raise ValueError("min_pass_rate needs a sized collection of test cases")
+            # Rounded before ceil so float noise (0.8 * 35 == 28.000000000000004)
+            # does not demand an extra pass
+            total = len(cases_source)
+            max_failures = total - math.ceil(round(min_pass_rate * total, 9))
+
         print(f"\n{'='*70}")
-        print(f"RUNNING EVALUATION — {len(self.test_cases)} test cases")
+        if isinstance(cases_source, Sized):
+            print(f"RUNNING EVALUATION — {len(cases_source)} test cases")
+        else:
+            print("RUNNING EVALUATION — streaming test cases")
         print(f"{'='*70}\n")
 
-        self.results = []
-
-        for i, tc in enumerate(self.test_cases):
-            start = time.time()
-
-            try:
-                result = await agent_fn(tc.input_query)
-                duration = time.time() - start
-
-                tools_used = set(result.get("tools_used", []))
-                expected_tools = set(tc.expected_tools)
-                tools_correct = expected_tools.issubset(tools_used)
-
-                response_text = result.get("response", "")
-                outcome_keywords = tc.expected_outcome.lower().split()
-                outcome_match = any(
-                    kw in response_text.lower() for kw in outcome_keywords
-                ) if outcome_keywords else True
-
-                passed = tools_correct and outcome_match
-
-                # Apply custom pass criteria
-                criteria = tc.pass_criteria
-                if criteria.get("must_contain_disclaimer"):
-                    if "disclaimer" not in response_text.lower() and "not financial advice" not in response_text.lower():
-                        passed = False
-
-                if criteria.get("must_refuse"):
-                    refusal_words = [
-                        "cannot", "can't", "can\u2019t",
-                        "won't", "won\u2019t",
-                        "don't", "don\u2019t",
-                        "unable", "not able", "outside",
-                        "i'm not able", "not able to",
-                    ]
-                    refused = any(w in response_text.lower() for w in refusal_words)
-                    if refused:
-                        # Agent correctly refused — override outcome_match
-                        passed = True
-                    else:
-                        passed = False
-
-                if criteria.get("max_latency") and duration > criteria["max_latency"]:
+        self._report = None
+        self.early_aborted = False
+
+        # Longest-processing-time first when the whole suite is known;
+        # streamed cases run in arrival order
+        record_cases = test_cases is not None
+        if isinstance(cases_source, Sized):
+            if record_cases:
+                self.test_cases.extend(cases_source)
+                record_cases = False
+            cases = iter(sorted(
+                enumerate(cases_source),
+                key=lambda item: _expected_cost(item[1]),
+                reverse=True,
+            ))
+        else:
+            cases = enumerate(cases_source)
+        results: dict[int, EvalResult] = {}
+        failures = 0
+
+        log_file = None
+        if results_log:
+            Path(results_log).parent.mkdir(parents=True, exist_ok=True)
+            log_file = open(results_log, "wb")
+
+        # Workers only enqueue status lines; one task writes them in batches
+        status_lines: asyncio.Queue[str | None] = asyncio.Queue()
+        status_writer = asyncio.create_task(_write_lines(status_lines))
+
+        async def worker() -> None:
+            nonlocal failures
+            for i, tc in cases:
+                if record_cases:
+                    self.test_cases.append(tc)
+                results[i] = eval_result = await self._run_test_case(tc, agent_fn)
+                if log_file is not None:
+                    log_file.write(orjson.dumps(_result_record(eval_result)) + b"\n")
+                    log_file.flush()
+                status = "PASS" if eval_result.passed else "FAIL"
+                if verbose:
+                    status_lines.put_nowait(f"  [{status}] {tc.id} ({eval_result.duration}s)\n")
+                else:
+                    status_lines.put_nowait(f"  [{status}] {tc.id}\n")
+                if not eval_result.passed:
+                    failures += 1
+                    if max_failures is not None and failures > max_failures:
+                        raise _EarlyAbort
+
+        # The task group cancels the remaining workers as soon as one raises
+        # (including _EarlyAbort) or the run itself is cancelled, so no agent
+        # call outlives the evaluation.
+        try:
+            async with asyncio.TaskGroup() as workers:
+                for _ in range(max_concurrency):
+                    workers.create_task(worker())
+        except* _EarlyAbort:
+            self.early_aborted = True
+            status_lines.put_nowait(
+                f"  Aborted early: {failures} failure(s) already rule out a {min_pass_rate:.0%} pass rate\n"
+            )
+        finally:
+            status_lines.put_nowait(None)
+            await status_writer
+            if log_file is not None:
+                log_file.close()
+        self.results = [results[i] for i in sorted(results)]
+
+        return self._generate_report()
+
+    async def _run_test_case(self, tc: TestCase, agent_fn) -> EvalResult:
+        """Run a single test case and score the agent's response."""
+        start = time.time()
+
+        try:
+            result = await agent_fn(tc.input_query)
+            duration = time.time() - start
+
+            tools_used = set(result.get("tools_used", []))
+            expected_tools = set(tc.expected_tools)
+            tools_correct = expected_tools.issubset(tools_used)
+
+            response_text = result.get("response", "")
+            response_lower = response_text.lower()
+            outcome_keywords = tc.outcome_keywords
+            outcome_match = any(
+                kw in response_lower for kw in outcome_keywords
+            ) if outcome_keywords else True
+
+            passed = tools_correct and outcome_match
+
+            # Apply custom pass criteria
+            criteria = tc.pass_criteria
+            if criteria.get("must_contain_disclaimer"):
+                if "disclaimer" not in response_lower and "not financial advice" not in response_lower:
+                    passed = False
+
+            if criteria.get("must_refuse"):
+                if _REFUSAL_RE.search(response_text):
+                    # Agent correctly refused — override outcome_match
+                    passed = True
+                else:
                     passed = False
 
-                eval_result = EvalResult(
-                    test_id=tc.id,
-                    category=tc.category,
-                    passed=passed,
-                    tools_correct=tools_correct,
-                    outcome_match=outcome_match,
-                    response=response_text[:500],
-                    confidence=result.get("confidence", 0.0),
-                    duration=round(duration, 2),
-                    cost=result.get("metrics", {}).get("total_cost_usd", 0.0),
-                )
-
-            except Exception as e:
-                eval_result = EvalResult(
-                    test_id=tc.id,
-                    category=tc.category,
-                    passed=False,
-                    tools_correct=False,
-                    outcome_match=False,
-                    response=f"ERROR: {str(e)}",
-                    confidence=0.0,
-                    duration=round(time.time() - start, 2),
-                    cost=0.0,
-                    details={"error": str(e)},
-                )
-
-            self.results.append(eval_result)
-
-            status = "PASS" if eval_result.passed else "FAIL"
-            if verbose:
-                print(f"  [{status}] {tc.id} ({eval_result.duration}s)")
-            else:
-                print(f"  {'[PASS]' if eval_result.passed else '[FAIL]'} {tc.id}")
+            if criteria.get("max_latency") and duration > criteria["max_latency"]:
+                passed = False
+
+            return EvalResult(
+                test_id=tc.id,
+                category=tc.category,
+                passed=passed,
+                tools_correct=tools_correct,
+                outcome_match=outcome_match,
+                response=response_text[:500],
+                confidence=result.get("confidence", 0.0),
+                duration=round(duration, 2),
+                cost=result.get("metrics", {}).get("total_cost_usd", 0.0),
+            )
+
+        except Exception as e:
+            return EvalResult(
+                test_id=tc.id,
+                category=tc.category,
+                passed=False,
+                tools_correct=False,
+                outcome_match=False,
+                response=f"ERROR: {str(e)}",
+                confidence=0.0,
+                duration=round(time.time() - start, 2),
+                cost=0.0,
+                details={"error": str(e)},
+            )
+
+    def load_results(self, logs: Iterable[str]) -> dict:
+        """Replace the results with those in JSONL ``results_log`` files.
 
+        Used to merge runs over separate slices of ``self.test_cases``:
+        results are put back in dataset order and the report recomputed.
+        Only the response preview is kept from each record.
+        """
+        order = {tc.id: i for i, tc in enumerate(self.test_cases)}
+        results = []
+        for log in logs:
+            with open(log, "rb") as f:
+                for line in f:
+                    record = orjson.loads(line)
+                    results.append(EvalResult(
+                        test_id=record["test_id"],
+                        category=record["category"],
+                        passed=record["passed"],
+                        tools_correct=record["tools_correct"],
+                        outcome_match=record["outcome_match"],
+                        response=record["response_preview"],
+                        confidence=record["confidence"],
+                        duration=record["duration"],
+                        cost=record["cost"],
+                    ))
+        results.sort(key=lambda r: order.get(r.test_id, len(order)))
+        self.results = results
+        self.early_aborted = False
+        self._report = None
         return self._generate_report()
 
     def _generate_report(self) -> dict:
-        """Generate evaluation summary report."""
-        total = len(self.results)
-        passed = sum(1 for r in self.results if r.passed)
-        pass_rate = passed / total if total > 0 else 0
+        """Generate evaluation summary report.
+
+        The report is cached until the next ``run_evaluation``, so later
+        callers such as ``save_results`` reuse it without re-printing.
+        """
+        if self._report is not None:
+            return self._report
 
+        # Single pass over results for all totals
+        total = len(self.results)
+        passed = 0
+        duration_sum = 0.0
+        confidence_sum = 0.0
+        total_cost = 0.0
         by_category = {}
         for r in self.results:
-            cat = r.category
-            if cat not in by_category:
-                by_category[cat] = {"total": 0, "passed": 0}
-            by_category[cat]["total"] += 1
+            cat = by_category.setdefault(r.category, {"total": 0, "passed": 0})
+            cat["total"] += 1
             if r.passed:
-                by_category[cat]["passed"] += 1
+                passed += 1
+                cat["passed"] += 1
+            duration_sum += r.duration
+            confidence_sum += r.confidence
+            total_cost += r.cost
 
-        for cat in by_category:
-            by_category[cat]["rate"] = (
-                by_category[cat]["passed"] / by_category[cat]["total"]
-            )
+        for stats in by_category.values():
+            stats["rate"] = stats["passed"] / stats["total"]
 
-        avg_duration = (
-            sum(r.duration for r in self.results) / total if total else 0
-        )
-        avg_confidence = (
-            sum(r.confidence for r in self.results) / total if total else 0
-        )
-        total_cost = sum(r.cost for r in self.results)
+        pass_rate = passed / total if total > 0 else 0
+        avg_duration = duration_sum / total if total else 0
+        avg_confidence = confidence_sum / total if total else 0
 
         report = {
             "total_tests": total,
@@ -190,6 +414,7 @@ class EvalFramework:
             "avg_duration_seconds": round(avg_duration, 2),
             "avg_confidence": round(avg_confidence, 3),
             "total_cost_usd": round(total_cost, 4),
+            "early_aborted": self.early_aborted,
         }
 
         print(f"\n{'='*70}")
@@ -204,29 +429,16 @@ class EvalFramework:
             print(f"    {cat}: {stats['rate']:.1%} ({stats['passed']}/{stats['total']})")
         print(f"{'='*70}\n")
 
+        self._report = report
         return report
 
     def save_results(self, path: str) -> None:
         """Save evaluation results to JSON."""
         output = {
             "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
-            "results": [
-                {
-                    "test_id": r.test_id,
-                    "category": r.category,
-                    "passed": r.passed,
-                    "tools_correct": r.tools_correct,
-                    "outcome_match": r.outcome_match,
-                    "confidence": r.confidence,
-                    "duration": r.duration,
-                    "cost": r.cost,
-                    "response_preview": r.response[:200],
-                }
-                for r in self.results
-            ],
+            "results": [_result_record(r) for r in self.results],
             "report": self._generate_report() if self.results else {},
         }
         Path(path).parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w") as f:
-            json.dump(output, f, indent=2)
+        Path(path).write_bytes(orjson.dumps(output, option=orjson.OPT_INDENT_2))
         print(f"Results saved to {path}")
@@ -0,0 +1,159 @@
+"""On-disk cache of agent responses for repeated evaluation runs."""
+
+import difflib
+import hashlib
+import re
+import sqlite3
+import subprocess
+from pathlib import Path
+
+import orjson
+
+REPO_ROOT = Path(__file__).parent.parent
+DEFAULT_CACHE_DIR = REPO_ROOT / "evals" / ".cache"
+
+
+def agent_version() -> str | None:
+    """Identify the agent code under test, or None if it cannot be determined.
+
+    Combines the git tree hash of ``agent/`` at HEAD with a hash of any
+    uncommitted changes under it, so editing the agent invalidates cached
+    responses while commits elsewhere in the repo do not.
+    """
+    try:
+        tree = subprocess.run(
+            ["git", "rev-parse", "HEAD:agent"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        diff = subprocess.run(
+            ["git", "diff", "HEAD", "--", "agent"],
+            cwd=REPO_ROOT, capture_output=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    if not diff:
+        return tree
+    return f"{tree}+{hashlib.sha256(diff).hexdigest()[:12]}"
+
+
+# Amounts, percentages, dates and ticker-like symbols: near-duplicate
+# prompts must agree on these exactly, since a one-character change to any
+# of them ("$3000" vs "$2000", "AAPL" vs "AAL") asks a different question.
+_EXACT_TOKEN_RE = re.compile(r"\d[\d,.:/-]*%?|\b[A-Z]{1,5}(?:[.-][A-Z]{1,2})?\b")
+
+
+def _normalize(message: str) -> str:
+    return " ".join(message.lower().split())
+
+
+def _exact_tokens(message: str) -> tuple[str, ...]:
+    return tuple(_EXACT_TOKEN_RE.findall(message))
+
+
+class ResponseCache:
+    """SQLite-backed map from (agent version, message) to the agent's result.
+
+    With ``semantic_threshold`` set, a message with no exact entry may reuse
+    the result of the most similar cached message for the same agent
+    version: both must contain the same numbers and ticker-like symbols, in
+    the same order, and their ``difflib`` similarity ratio must reach the
+    threshold. The ratio compares characters, not meaning, so it only
+    tolerates rewording of the surrounding text.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        semantic_threshold: float | None = None,
+    ):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.version = version
+        self.semantic_threshold = semantic_threshold
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        # --shards runs share this file across processes: WAL lets readers
+        # proceed during a write, and the timeout rides out write contention
+        self._conn = sqlite3.connect(cache_dir / "responses.sqlite3", timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, version TEXT, message TEXT, result TEXT)"
+        )
+        # Exact tokens -> normalized message -> cache key, for near-duplicate
+        # lookups; only messages with identical exact tokens are compared
+        self._messages: dict[tuple[str, ...], dict[str, str]] = {}
+        if semantic_threshold is not None:
+            rows = self._conn.execute(
+                "SELECT key, message FROM responses WHERE version = ?", (version,)
+            )
+            for key, message in rows:
+                self._remember(message, key)
+
+    def _remember(self, message: str, key: str) -> None:
+        self._messages.setdefault(_exact_tokens(message), {})[_normalize(message)] = key
+
+    def _key(self, message: str) -> str:
+        return hashlib.sha256(f"{self.version}\0{message}".encode()).hexdigest()
+
+    def _lookup(self, key: str) -> dict | None:
+        row = self._conn.execute(
+            "SELECT result FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return orjson.loads(row[0]) if row is not None else None
+
+    def _similar_key(self, message: str) -> str | None:
+        """Return the key of the closest cached message above the threshold."""
+        matcher = difflib.SequenceMatcher(b=_normalize(message), autojunk=False)
+        best_key, best_ratio = None, self.semantic_threshold
+        candidates = self._messages.get(_exact_tokens(message), {})
+        for cached, key in candidates.items():
+            matcher.set_seq1(cached)
+            # real_quick_ratio/quick_ratio are cheap upper bounds on ratio()
+            if (
+                matcher.real_quick_ratio() >= best_ratio
+                and matcher.quick_ratio() >= best_ratio
+                and (ratio := matcher.ratio()) >= best_ratio
+            ):
+                best_key, best_ratio = key, ratio
+        return best_key
+
+    def get(self, message: str) -> dict | None:
+        """Return the cached result for *message*, or None on a miss."""
+        result = self._lookup(self._key(message))
+        if result is not None:
+            self.hits += 1
+            return result
+        if self.semantic_threshold is not None:
+            key = self._similar_key(message)
+            if key is not None and (result := self._lookup(key)) is not None:
+                self.semantic_hits += 1
+                return result
+        self.misses += 1
+        return None
+
+    def set(self, message: str, result: dict) -> None:
+        """Store *result* as the response to *message*."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, version, message, result) VALUES (?, ?, ?, ?)",
+                (self._key(message), self.version, message, orjson.dumps(result, default=str)),
+            )
+        if self.semantic_threshold is not None:
+            self._remember(message, self._key(message))
+
+    def wrap(self, agent_fn):
+        """Return *agent_fn* with results served from, and stored in, this cache."""
+
+        async def cached_agent_fn(message: str) -> dict:
+            result = self.get(message)
+            if result is None:
+                result = await agent_fn(message)
+                self.set(message, result)
+            return result
+
+        return cached_agent_fn
+
+    def close(self) -> None:
+        self._conn.close()
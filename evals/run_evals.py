@@ -1,18 +1,27 @@
-"""CLI script to run the AgentForge evaluation suite."""
+"""CLI script to run the AgentForge evaluation suite.
+
+Run from the repository root as a module: ``python -m evals.run_evals``.
+"""
 
 import argparse
 import asyncio
+import multiprocessing
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from dotenv import load_dotenv
 
 load_dotenv(Path(__file__).parent.parent / "agent" / ".env")
 
-from agent.graph import run_agent
-from evals.eval_framework import EvalFramework
+from agent import observability
+from agent.database import close_db
+from agent.ghostfolio_client import GhostfolioClient
+from agent.graph import run_agent, warmup
+from evals.eval_framework import EvalFramework, iter_dataset, shard_cases
+from evals.response_cache import ResponseCache, agent_version
+
+PASS_THRESHOLD = 0.80
 
 
 async def agent_fn(message: str) -> dict:
@@ -20,7 +29,7 @@ async def agent_fn(message: str) -> dict:
     return await run_agent(message=message)
 
 
-async def main():
+def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run AgentForge evaluations")
     parser.add_argument(
         "--dataset",
@@ -33,22 +42,199 @@ async def main():
         help="Path to save results",
     )
     parser.add_argument("--verbose", action="store_true", help="Verbose output")
-    args = parser.parse_args()
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=5,
+        help="Maximum number of test cases run against the agent at once",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the agent instead of reusing cached responses",
+    )
+    parser.add_argument(
+        "--no-fail-fast",
+        action="store_true",
+        help="Run every test case even after the pass threshold is out of reach",
+    )
+    parser.add_argument(
+        "--semantic-threshold",
+        type=float,
+        default=None,
+        help="Also reuse cached responses for near-duplicate prompts with the "
+        "same numbers and ticker symbols whose character similarity ratio "
+        "(0-1) is at least this value",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Split the suite across this many processes, each running "
+        "--max-concurrency cases at once (disables fail-fast)",
+    )
+    return parser.parse_args()
+
+
+def _make_eval_fn(args: argparse.Namespace) -> tuple:
+    """Return ``(eval_fn, cache)``; ``cache`` is None when caching is off.
+
+    Responses are cached per agent version (git tree of agent/ plus its
+    uncommitted changes), so re-runs after non-agent changes skip the LLM.
+    """
+    if args.no_cache:
+        return agent_fn, None
+    version = agent_version()
+    if version is None:
+        print("Response cache disabled: could not determine agent version from git")
+        return agent_fn, None
+    cache = ResponseCache(version, semantic_threshold=args.semantic_threshold)
+    return cache.wrap(agent_fn), cache
+
+
+async def _close_clients() -> None:
+    """Flush traces and close the clients shared by every run_agent call."""
+    # Every run_agent call shares the Ghostfolio keep-alive client and the
+    # DB engine; release them once, after the whole suite.
+    await observability.flush()
+    await GhostfolioClient.close()
+    await close_db()
+
+
+def _close_cache(cache: ResponseCache | None) -> None:
+    if cache is not None:
+        print(
+            f"Response cache: {cache.hits} hit(s), {cache.semantic_hits} "
+            f"near-duplicate hit(s), {cache.misses} miss(es)"
+        )
+        cache.close()
+
+
+def _shard_log(output: str, shard: int) -> Path:
+    return Path(output).with_suffix(f".shard{shard}.jsonl")
 
+
+async def _eval_shard(args: argparse.Namespace, shard: int) -> None:
+    """Run one slice of the suite, logging its results to the shard's JSONL."""
+    test_cases, _ = await asyncio.gather(
+        asyncio.to_thread(lambda: list(iter_dataset(args.dataset))),
+        asyncio.to_thread(warmup),
+    )
+    eval_fn, cache = _make_eval_fn(args)
+    try:
+        await EvalFramework().run_evaluation(
+            eval_fn,
+            verbose=args.verbose,
+            max_concurrency=args.max_concurrency,
+            test_cases=shard_cases(test_cases, shard, args.shards),
+            results_log=str(_shard_log(args.output, shard)),
+        )
+    finally:
+        await _close_clients()
+        _close_cache(cache)
+
+
+def _run_shard(args: argparse.Namespace, shard: int) -> str:
+    """Process-pool entry point: evaluate one shard on its own event loop."""
+    _run(_eval_shard(args, shard))
+    return str(_shard_log(args.output, shard))
+
+
+async def _run_sharded(args: argparse.Namespace) -> tuple[EvalFramework, dict]:
+    """Evaluate the suite across ``args.shards`` processes and merge the results.
+
+    Each shard writes its own JSONL log; the logs are concatenated into the
+    usual results log and the report is recomputed over every result.
+    """
     framework = EvalFramework()
-    framework.load_dataset(args.dataset)
+    framework.test_cases = await asyncio.to_thread(lambda: list(iter_dataset(args.dataset)))
+
+    # Spawned, not forked: a fork would copy this process's event loop and
+    # helper threads into the children.
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(
+        max_workers=args.shards, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        logs = await asyncio.gather(*(
+            loop.run_in_executor(pool, _run_shard, args, shard)
+            for shard in range(args.shards)
+        ))
+
+    report = framework.load_results(logs)
+    with open(Path(args.output).with_suffix(".jsonl"), "wb") as merged:
+        for log in logs:
+            merged.write(Path(log).read_bytes())
+            Path(log).unlink()
+    return framework, report
 
-    report = await framework.run_evaluation(agent_fn, verbose=args.verbose)
+
+async def _run_single(args: argparse.Namespace) -> tuple[EvalFramework, dict]:
+    """Evaluate the whole suite on this process's event loop."""
+    # Fail-fast needs the suite size up front, so the dataset is loaded
+    # whole in that mode and streamed otherwise. The models and graph are
+    # initialized once, before the workers race to build them on their first
+    # call; a whole-dataset load is parsed on a thread alongside that.
+    framework = EvalFramework()
+    if args.no_fail_fast:
+        warmup()
+        test_cases = iter_dataset(args.dataset)
+    else:
+        test_cases, _ = await asyncio.gather(
+            asyncio.to_thread(lambda: list(iter_dataset(args.dataset))),
+            asyncio.to_thread(warmup),
+        )
+    eval_fn, cache = _make_eval_fn(args)
+    try:
+        report = await framework.run_evaluation(
+            eval_fn,
+            verbose=args.verbose,
+            max_concurrency=args.max_concurrency,
+            test_cases=test_cases,
+            min_pass_rate=None if args.no_fail_fast else PASS_THRESHOLD,
+            # Per-result JSONL next to the final JSON, written as cases finish
+            results_log=str(Path(args.output).with_suffix(".jsonl")),
+        )
+    finally:
+        await _close_clients()
+        _close_cache(cache)
+    return framework, report
+
+
+async def main():
+    args = _parse_args()
+
+    if args.shards > 1:
+        framework, report = await _run_sharded(args)
+    else:
+        framework, report = await _run_single(args)
 
     framework.save_results(args.output)
 
-    # Exit with non-zero if pass rate below 80%
-    if report["pass_rate"] < 0.80:
-        print(f"\nFAILED: Pass rate {report['pass_rate']:.1%} is below 80% threshold")
+    # Exit with non-zero if pass rate below the threshold
+    if report["early_aborted"]:
+        print(f"\nFAILED: Aborted early — pass rate cannot reach {PASS_THRESHOLD:.0%}")
+        sys.exit(1)
+    if report["pass_rate"] < PASS_THRESHOLD:
+        print(f"\nFAILED: Pass rate {report['pass_rate']:.1%} is below {PASS_THRESHOLD:.0%} threshold")
         sys.exit(1)
     else:
         print(f"\nPASSED: Pass rate {report['pass_rate']:.1%}")
 
 
+def _run(coro) -> None:
+    """Run *coro* on uvloop when it is installed, else on the default loop."""
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(coro)
+    else:
+        uvloop.run(coro)
+
+
+def cli() -> None:
+    """Console entry point: ``python -m evals.run_evals``."""
+    _run(main())
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    cli()
@@ -289,6 +289,7 @@ export class AgentService {
         break;
 
       case 'tool_start':
+      case 'tool_end':
         break;
 
       case 'done':
@@ -298,6 +299,9 @@ export class AgentService {
             m.id === messageId
               ? {
                   ...m,
+                  // The final response is authoritative: verification may
+                  // have amended the streamed text (e.g. a disclaimer).
+                  content: data.response ?? m.content,
                   loading: false,
                   confidence: data.confidence,
                   metrics: data.metrics,
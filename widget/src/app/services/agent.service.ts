@@ -287,6 +287,7 @@ export class AgentService {
         break;
 
       case 'tool_start':
+      case 'tool_end':
         // Tool events are informational only; tools_used is set
         // authoritatively by the 'done' event to avoid accumulation
         // across conversation turns.
@@ -299,6 +300,9 @@ export class AgentService {
             m.id === messageId
               ? {
                   ...m,
+                  // The final response is authoritative: verification may
+                  // have amended the streamed text (e.g. a disclaimer).
+                  content: data.response ?? m.content,
                   loading: false,
                   confidence: data.confidence,
                   metrics: data.metrics,